@@ -230,6 +230,15 @@ fips_rules = {}
 for rule_group in rules["fips_rules"]:
     fips_rules[rule_group] = _process(rules[rule_group])
 
+# Cert ID rules matched directly against cert IDs, file names and metadata (without separators), compiled per scheme.
+cc_cert_id_patterns: dict[str, list[re.Pattern]] = {
+    scheme: [re.compile(rule) for rule in scheme_rules] for scheme, scheme_rules in rules["cc_cert_id"].items()
+}
+cc_filename_cert_id_patterns: dict[str, list[re.Pattern]] = {
+    scheme: [re.compile(rule) for rule in scheme_rules] if scheme_rules else []
+    for scheme, scheme_rules in rules["cc_filename_cert_id"].items()
+}
+
 
 PANDAS_KEYWORDS_CATEGORIES: Final[list[str]] = [
     "symmetric_crypto",
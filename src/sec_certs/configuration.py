@@ -149,7 +149,7 @@ class Configuration(BaseSettings):
 
     def _set_attrs_from_cfg(self, other_cfg: Configuration, fields_to_set: set[str] | None) -> None:
         if not fields_to_set:
-            fields_to_set = set(Configuration.model_fields.keys())
+            fields_to_set = set(Configuration.model_fields)
         for field in [x for x in other_cfg.model_fields if x in fields_to_set]:
             setattr(self, field, getattr(other_cfg, field))
 
@@ -163,7 +163,7 @@ class Configuration(BaseSettings):
         with Path(yaml_path).open("r") as handle:
             data = yaml.safe_load(handle)
         other_cfg = Configuration.model_validate(data)
-        keys_to_rewrite = set(data.keys()).union(other_cfg._get_nondefault_keys())
+        keys_to_rewrite = set(data).union(other_cfg._get_nondefault_keys())
         self._set_attrs_from_cfg(other_cfg, keys_to_rewrite)
 
     def to_yaml(self, yaml_path: str | Path) -> None:
@@ -29,13 +29,14 @@ from sec_certs.model import (
 )
 from sec_certs.model.cc_matching import CCSchemeMatcher
 from sec_certs.sample.cc import CCCertificate
-from sec_certs.sample.cc_certificate_id import CertificateId
+from sec_certs.sample.cc_certificate_id import CertificateId, canonicalize
 from sec_certs.sample.cc_maintenance_update import CCMaintenanceUpdate
 from sec_certs.sample.cc_scheme import EntryType
 from sec_certs.sample.protection_profile import ProtectionProfile
 from sec_certs.serialization.json import ComplexSerializableType, serialize
 from sec_certs.utils import helpers, sanitization
 from sec_certs.utils import parallel_processing as cert_processing
+from sec_certs.utils.extract import scheme_frontpage_functions
 from sec_certs.utils.profiling import staged
 
 
@@ -311,8 +312,13 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
         """
         Merges dictionary of certificates into the dataset. Assuming they all are CommonCriteria certificates
         """
-        new_certs = {x.dgst: x for x in certs.values() if x not in self}
-        certs_to_merge = [x for x in certs.values() if x in self]
+        new_certs = {}
+        certs_to_merge = []
+        for crt in certs.values():
+            if crt.dgst in self.certs:
+                certs_to_merge.append(crt)
+            else:
+                new_certs[crt.dgst] = crt
         self.certs.update(new_certs)
 
         for crt in certs_to_merge:
@@ -381,7 +387,7 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
         """
         Creates dictionary of new certificates from csv sources.
         """
-        csv_sources = list(self.CSV_PRODUCTS_URL.keys())
+        csv_sources = list(self.CSV_PRODUCTS_URL)
         csv_sources = [x for x in csv_sources if "active" not in x or get_active]
         csv_sources = [x for x in csv_sources if "archived" not in x or get_archived]
 
@@ -519,7 +525,7 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
         """
         Prepares dictionary of certificates from all html files.
         """
-        html_sources = list(self.HTML_PRODUCTS_URL.keys())
+        html_sources = list(self.HTML_PRODUCTS_URL)
         if get_active is False:
             html_sources = [x for x in html_sources if "active" not in x]
         if get_archived is False:
@@ -546,11 +552,7 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
             formatted_datetime = date_string[0] + date_string[1] + " " + time_string
             return datetime.strptime(formatted_datetime, " %B %d %Y %I:%M %p")
 
-        def _parse_table(
-            soup: BeautifulSoup, cert_status: str, table_id: str, category_string: str
-        ) -> dict[str, CCCertificate]:
-            tables = soup.find_all("table", id=table_id)
-
+        def _parse_table(tables: list[Tag], cert_status: str, category_string: str) -> dict[str, CCCertificate]:
             if not len(tables) <= 1:
                 raise ValueError(
                     f'The "{file.name}" was expected to contain <1 <table> element. Instead, it contains: {len(tables)} <table> elements.'
@@ -620,9 +622,14 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
         with file.open("r") as handle:
             soup = BeautifulSoup(handle, "html5lib")
 
+        # Collect the tables of all the categories in a single walk over the document.
+        tables_by_id: dict[str, list[Tag]] = {}
+        for table in soup.find_all("table", id=cc_table_ids):
+            tables_by_id.setdefault(table["id"], []).append(table)
+
         certs = {}
         for key, val in cat_dict.items():
-            certs.update(_parse_table(soup, cert_status, key, val))
+            certs.update(_parse_table(tables_by_id.get(key, []), cert_status, val))
 
         return certs
 
@@ -776,7 +783,15 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
 
     @staged(logger, "Extracting report frontpages")
     def _extract_report_frontpage(self) -> None:
-        certs_to_process = [x for x in self if x.state.report.is_ok_to_analyze()]
+        certs_to_process = []
+        for cert in self:
+            if not cert.state.report.is_ok_to_analyze():
+                continue
+            # Only the schemes with a frontpage parser do any work, the rest need not be shipped to worker processes.
+            if cert.scheme in scheme_frontpage_functions:
+                certs_to_process.append(cert)
+            else:
+                cert.pdf_data.report_frontpage = {}
         processed_certs = cert_processing.process_parallel(
             CCCertificate.extract_report_pdf_frontpage,
             certs_to_process,
@@ -847,7 +862,7 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
         "Computing heuristics: Deriving information about certificate ids from artifacts.",
     )
     def _compute_normalized_cert_ids(self) -> None:
-        for cert in self:
+        for cert in self.certs.values():
             cert.compute_heuristics_cert_id()
 
     @staged(
@@ -858,11 +873,11 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
         transitive_cve_finder = TransitiveVulnerabilityFinder(lambda cert: cert.heuristics.cert_id)
         transitive_cve_finder.fit(self.certs, lambda cert: cert.heuristics.report_references)
 
-        for dgst in self.certs:
+        for dgst, cert in self.certs.items():
             transitive_cve = transitive_cve_finder.predict_single_cert(dgst)
 
-            self.certs[dgst].heuristics.direct_transitive_cves = transitive_cve.direct_transitive_cves
-            self.certs[dgst].heuristics.indirect_transitive_cves = transitive_cve.indirect_transitive_cves
+            cert.heuristics.direct_transitive_cves = transitive_cve.direct_transitive_cves
+            cert.heuristics.indirect_transitive_cves = transitive_cve.indirect_transitive_cves
 
     @staged(logger, "Computing heuristics: Matching scheme data.")
     def _compute_scheme_data(self):
@@ -893,8 +908,29 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
             else None
             for cert in self
         }
+
+        # Index the cert IDs by their components, so that each certificate is compared only to the IDs that share
+        # its version stem instead of to the whole dataset.
+        scheme_index: dict[str, set[str]] = {}
+        component_index: dict[tuple[str, str, str], set[str]] = {}
+        for dgst, cert_id in cert_ids.items():
+            if cert_id is None:
+                continue
+            scheme_index.setdefault(cert_id.scheme, set()).add(dgst)
+            for key, value in cert_id.meta.items():
+                if value is not None:
+                    component_index.setdefault((cert_id.scheme, key, value), set()).add(dgst)
+
         for cert in self:
-            cert.compute_heuristics_cert_versions(cert_ids)
+            own = cert_ids[cert.dgst]
+            if own is None:
+                cert.compute_heuristics_cert_versions({cert.dgst: None})
+                continue
+            candidates = scheme_index[own.scheme]
+            for key, value in CCCertificate.cert_id_version_stem(own).items():
+                if value is not None:
+                    candidates = candidates & component_index[(own.scheme, key, value)]
+            cert.compute_heuristics_cert_versions({dgst: cert_ids[dgst] for dgst in candidates | {cert.dgst}})
 
     def _compute_heuristics(self) -> None:
         self._compute_normalized_cert_ids()
@@ -915,27 +951,26 @@ class CCDataset(Dataset[CCCertificate, CCAuxiliaryDatasets], ComplexSerializable
                 for scheme, matches in kws["cc_cert_id"].items():
                     for match in matches:
                         try:
-                            canonical = CertificateId(scheme, match).canonical
-                            res.add(canonical)
+                            res.add(canonicalize(match, scheme))
                         except Exception:
                             res.add(match)
                 return res
 
             return func
 
+        finders: dict[str, ReferenceFinder] = {}
         for ref_source in ("report", "st"):
             kw_source = f"{ref_source}_keywords"
             dep_attr = f"{ref_source}_references"
 
             finder = ReferenceFinder()
             finder.fit(self.certs, lambda cert: cert.heuristics.cert_id, ref_lookup(kw_source))  # type: ignore
+            finders[dep_attr] = finder
 
-            for dgst in self.certs:
-                setattr(
-                    self.certs[dgst].heuristics,
-                    dep_attr,
-                    finder.predict_single_cert(dgst, keep_unknowns=False),
-                )
+        # Assign the references from both sources in a single pass over the certificates.
+        for dgst, cert in self.certs.items():
+            for dep_attr, finder in finders.items():
+                setattr(cert.heuristics, dep_attr, finder.predict_single_cert(dgst, keep_unknowns=False))
 
     @serialize
     def process_auxiliary_datasets(self, download_fresh: bool = False) -> None:
@@ -36,6 +36,7 @@ class CVEDataset(JSONPathDataset, ComplexSerializableType):
         self.json_path = Path(json_path)
         self._cpe_uri_to_cve_ids_lookup: dict[str, set[str]] = {}
         self._cves_with_vulnerable_configurations: list[CVE] = []
+        self._cpe_uri_to_configured_cves_lookup: dict[str, set[int]] = {}
         self.last_update_timestamp = last_update_timestamp
 
     def __iter__(self):
@@ -113,6 +114,20 @@ class CVEDataset(JSONPathDataset, ComplexSerializableType):
         for index in sorted(indices_to_delete, reverse=True):
             del self._cves_with_vulnerable_configurations[index]
 
+    def _build_configurations_lookup_dict(self) -> None:
+        """
+        Indexes the CVEs with criteria configurations by the CPE uris from the first component of their configurations.
+        A configuration matches only such CPE uris that intersect all of its components, the first one included.
+        Hence, the index yields a superset of the CVEs whose configurations may match given CPE uris.
+        """
+        self._cpe_uri_to_configured_cves_lookup = {}
+        for index, cve in enumerate(self._cves_with_vulnerable_configurations):
+            for configuration in cve.vulnerable_criteria_configurations:
+                if not configuration._expanded_components:
+                    continue
+                for cpe_uri in configuration._expanded_components[0]:
+                    self._cpe_uri_to_configured_cves_lookup.setdefault(cpe_uri, set()).add(index)
+
     def build_lookup_dict(
         self,
         cpe_match_feed: dict,
@@ -122,6 +137,7 @@ class CVEDataset(JSONPathDataset, ComplexSerializableType):
         cpe_uris_of_interest = {x.uri for x in limit_to_cpes} if limit_to_cpes else None
         self._get_cves_with_criteria_configurations()
         self._expand_criteria_configurations(cpe_match_feed, cpe_uris_of_interest)
+        self._build_configurations_lookup_dict()
 
         logger.info("Building lookup dictionaries.")
         cve: CVE
@@ -152,9 +168,13 @@ class CVEDataset(JSONPathDataset, ComplexSerializableType):
         )
 
     def _get_cves_from_criteria_configurations(self, cpe_uris: set[str]) -> set[str]:
+        candidate_indices = set(
+            itertools.chain.from_iterable(self._cpe_uri_to_configured_cves_lookup.get(x, ()) for x in cpe_uris)
+        )
+        candidates = (self._cves_with_vulnerable_configurations[i] for i in candidate_indices)
         return {
             cve.cve_id
-            for cve in self._cves_with_vulnerable_configurations
+            for cve in candidates
             if any(configuration.matches(cpe_uris) for configuration in cve.vulnerable_criteria_configurations)
         }
 
@@ -292,9 +292,10 @@ class Dataset(Generic[CertSubType, AuxiliaryDatasetsSubType], ComplexSerializabl
         new_root_dir = Path(new_root_dir)
         if new_root_dir.is_file():
             raise ValueError("New root dir must be a directory, not an existing file.")
-        new_root_dir.mkdir(parents=True, exist_ok=True)
-
-        shutil.copytree(str(self.root_dir), str(new_root_dir), dirs_exist_ok=True)
+        old_root_dir = self.root_dir.resolve()
+        if new_root_dir.resolve() == old_root_dir or old_root_dir in new_root_dir.resolve().parents:
+            raise ValueError("New root dir must not be the current root dir or lie inside of it.")
+        helpers.move_tree(self.root_dir, new_root_dir)
         shutil.rmtree(self.root_dir)
         self.root_dir = new_root_dir
 
@@ -710,6 +711,7 @@ class Dataset(Generic[CertSubType, AuxiliaryDatasetsSubType], ComplexSerializabl
         Enriches the dataset with `certs`
         :param List[Certificate] certs: new certs to include into the dataset.
         """
-        if any(x not in self for x in certs):
+        new_certs = {x.dgst: x for x in certs}
+        if any(x not in self.certs for x in new_certs):
             logger.warning("Updating dataset with certificates outside of the dataset!")
-        self.certs.update({x.dgst: x for x in certs})
+        self.certs.update(new_certs)
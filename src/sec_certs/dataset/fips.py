@@ -205,14 +205,7 @@ class FIPSDataset(Dataset[FIPSCertificate, FIPSAuxiliaryDatasets], ComplexSerial
             html = BeautifulSoup(handle.read(), "html5lib")
 
         table = [x for x in html.find(id="searchResultsTable").tbody.contents if x != "\n"]
-        cert_ids: set[str] = set()
-
-        for entry in table:
-            if isinstance(entry, NavigableString):
-                continue
-            cert_id = entry.find("a").text
-            if cert_id not in cert_ids:
-                cert_ids.add(cert_id)
+        cert_ids: set[str] = {entry.find("a").text for entry in table if not isinstance(entry, NavigableString)}
 
         return [FIPSCertificate(int(cert_id)) for cert_id in cert_ids]
 
@@ -288,12 +281,13 @@ class FIPSDataset(Dataset[FIPSCertificate, FIPSAuxiliaryDatasets], ComplexSerial
     @staged(logger, "Extracting Algorithms from policy tables")
     def _extract_algorithms_from_policy_tables(self):
         certs_to_process = [x for x in self if x.state.policy_is_ok_to_analyze()]
-        cert_processing.process_parallel(
+        processed_certs = cert_processing.process_parallel(
             FIPSCertificate.get_algorithms_from_policy_tables,
             certs_to_process,
             use_threading=False,
             progress_bar_desc="Extracting Algorithms from policy tables",
         )
+        self.update_with_certs(processed_certs)
 
     @staged(logger, "Extracting security policy metadata from the pdfs")
     def _extract_policy_pdf_metadata(self) -> None:
@@ -314,10 +308,10 @@ class FIPSDataset(Dataset[FIPSCertificate, FIPSAuxiliaryDatasets], ComplexSerial
         transitive_cve_finder = TransitiveVulnerabilityFinder(lambda cert: str(cert.cert_id))
         transitive_cve_finder.fit(self.certs, lambda cert: cert.heuristics.policy_processed_references)
 
-        for dgst in self.certs:
+        for dgst, cert in self.certs.items():
             transitive_cve = transitive_cve_finder.predict_single_cert(dgst)
-            self.certs[dgst].heuristics.direct_transitive_cves = transitive_cve.direct_transitive_cves
-            self.certs[dgst].heuristics.indirect_transitive_cves = transitive_cve.indirect_transitive_cves
+            cert.heuristics.direct_transitive_cves = transitive_cve.direct_transitive_cves
+            cert.heuristics.indirect_transitive_cves = transitive_cve.indirect_transitive_cves
 
     @staged(logger, "Computing heuristics: references between certificates.")
     def _compute_references(self, keep_unknowns: bool = False) -> None:
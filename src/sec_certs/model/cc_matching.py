@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 import contextlib
-import re
 from collections.abc import Iterable, Mapping, Sequence
 from operator import itemgetter
 from typing import Any
 
-from sec_certs.cert_rules import rules
+from sec_certs.cert_rules import cc_filename_cert_id_patterns
 from sec_certs.configuration import config
 from sec_certs.model.matching import AbstractMatcher
 from sec_certs.sample.cc import CCCertificate
@@ -77,14 +76,14 @@ class CCSchemeMatcher(AbstractMatcher[CCCertificate]):
         if self._level:
             self._level = self._level.upper().replace("AUGMENTED", "").replace("WITH", "")
 
-        filename_rules = rules["cc_filename_cert_id"][self.scheme]
+        filename_rules = cc_filename_cert_id_patterns[self.scheme]
         scheme_meta = schemes[self.scheme]
         if filename_rules and self._canonical_cert_id is None:
             cert_link = self._get_from_entry("cert_link")
             if cert_link:
                 cert_fname = sanitize_link_fname(cert_link)
                 for rule in filename_rules:
-                    if match := re.match(rule, cert_fname):
+                    if match := rule.match(cert_fname):
                         with contextlib.suppress(Exception):
                             meta = match.groupdict()
                             self._canonical_cert_id = scheme_meta(meta)
@@ -94,7 +93,7 @@ class CCSchemeMatcher(AbstractMatcher[CCCertificate]):
             if report_link and self._canonical_cert_id is None:
                 report_fname = sanitize_link_fname(report_link)
                 for rule in filename_rules:
-                    if match := re.match(rule, report_fname):
+                    if match := rule.match(report_fname):
                         with contextlib.suppress(Exception):
                             meta = match.groupdict()
                             self._canonical_cert_id = scheme_meta(meta)
@@ -21,6 +21,9 @@ from sec_certs.utils.tqdm import tqdm
 
 logger = logging.getLogger(__name__)
 
+VENDOR_SEPARATORS_RE = re.compile(r"[,/]")
+JUST_NUMBERS_RE = re.compile(r"(\d{1,5})(\.\d{1,5})")
+
 
 class CPEClassifier:
     """
@@ -37,6 +40,8 @@ class CPEClassifier:
         self.match_threshold = match_threshold
         self.n_max_matches = n_max_matches
         self.nlp = load_spacy_model(spacy_model_to_use)
+        self._sanitized_cpes: dict[str, tuple[str, str]] = {}
+        self._candidate_vendors: dict[str, set[str]] = {}
 
     def fit(self, X: list[CPE], y: list[str] | None = None) -> CPEClassifier:
         """
@@ -65,17 +70,26 @@ class CPEClassifier:
         - vendor_to_version_: each vendor is mapped to set of versions that appear in combination with vendor in CPE dataset
         - vendor_version_to_cpe_: Each (vendor, version) tuple is mapped to a set of CPE items that appear in combination with this tuple in CPE dataset
         - vendors_: Just aggregates set of vendors, used for prunning later on.
+        - _vendor_to_versions_by_initial: versions of each vendor grouped by their first character, used to skip
+          versions that cannot share a prefix with the versions of a certificate.
 
         :param List[CPE] X: List of CPEs that will be used to build the dictionaries
         """
         sufficiently_long_cpes = self._filter_short_cpes(X)
+        self._sanitized_cpes = {}
+        self._candidate_vendors = {}
         self.vendor_to_versions_ = {x.vendor: set() for x in sufficiently_long_cpes}
-        self.vendors_ = set(self.vendor_to_versions_.keys())
+        self.vendors_ = set(self.vendor_to_versions_)
         self.vendor_version_to_cpe_ = {}
+        self._vendor_to_versions_by_initial: dict[str, dict[str, set[str]]] = {}
 
         for cpe in tqdm(sufficiently_long_cpes, desc="Fitting the CPE classifier"):
             self.vendor_to_versions_[cpe.vendor].add(cpe.version)
             self.vendor_version_to_cpe_.setdefault((cpe.vendor, cpe.version), set()).add(cpe)
+            if cpe.version:
+                self._vendor_to_versions_by_initial.setdefault(cpe.vendor, {}).setdefault(cpe.version[0], set()).add(
+                    cpe.version
+                )
 
     def predict(self, X: list[tuple[str, str, str]]) -> list[set[str] | None]:
         """
@@ -115,14 +129,38 @@ class CPEClassifier:
         candidate_vendors = self._get_candidate_list_of_vendors(
             discard_trademark_symbols(vendor).lower() if vendor else vendor
         )
+        return self._predict_single_cert(
+            candidate_vendors, product_name, lemmatized_product_name, versions, relax_version, relax_title
+        )
+
+    def _predict_single_cert(
+        self,
+        candidate_vendors: set[str],
+        product_name: str,
+        lemmatized_product_name: str,
+        versions: set[str],
+        relax_version: bool = False,
+        relax_title: bool = False,
+    ) -> set[str] | None:
+        """
+        Does the actual work of `predict_single_cert()`. Expects the vendor and the product name to be already
+        processed, so that the relaxed retries do not have to lemmatize the product name again.
+        """
         candidates = self._get_candidate_cpe_matches(candidate_vendors, versions)
         candidates = self._filter_candidates_by_platform(candidates, product_name)
         candidates = self._filter_candidates_by_update(candidates, lemmatized_product_name)
 
-        ratings = [
-            self._compute_best_match(cpe, lemmatized_product_name, candidate_vendors, versions, relax_title=relax_title)
-            for cpe in candidates
-        ]
+        # CPE records that differ only in fields ignored by the rating (e.g. language or edition) are rated just once.
+        ratings_by_key: dict[tuple[str, str, str, bool, bool], float] = {}
+        ratings = []
+        for cpe in candidates:
+            key = (*self._sanitize_cpe(cpe), cpe.vendor, bool(cpe.title), cpe.item_name == "big-ip")
+            if (rating := ratings_by_key.get(key)) is None:
+                rating = self._compute_best_match(
+                    cpe, lemmatized_product_name, candidate_vendors, versions, relax_title=relax_title
+                )
+                ratings_by_key[key] = rating
+            ratings.append(rating)
         threshold = self.match_threshold if not relax_version else 100
         final_matches_aux: list[tuple[float, CPE]] = list(filter(lambda x: x[0] >= threshold, zip(ratings, candidates)))
         final_matches_aux = sorted(final_matches_aux, key=operator.itemgetter(0, 1), reverse=True)
@@ -131,13 +169,23 @@ class CPEClassifier:
         }
 
         if not relax_title and not final_matches:
-            final_matches = self.predict_single_cert(
-                vendor, product_name, versions, relax_version=relax_version, relax_title=True
+            final_matches = self._predict_single_cert(
+                candidate_vendors,
+                product_name,
+                lemmatized_product_name,
+                versions,
+                relax_version=relax_version,
+                relax_title=True,
             )
 
         if not relax_version and not final_matches:
-            final_matches = self.predict_single_cert(
-                vendor, product_name, {constants.CPE_VERSION_NA}, relax_version=True, relax_title=relax_title
+            final_matches = self._predict_single_cert(
+                candidate_vendors,
+                product_name,
+                lemmatized_product_name,
+                {constants.CPE_VERSION_NA},
+                relax_version=True,
+                relax_title=relax_title,
             )
 
         return final_matches if final_matches else None
@@ -191,6 +239,24 @@ class CPEClassifier:
         }
         return [x for x in cpes if filter_condition(x, crt_platforms)]
 
+    def _sanitize_cpe(self, cpe: CPE) -> tuple[str, str]:
+        """
+        Sanitizes title (or its substitute built from the URI when the title is missing) and item name of the CPE.
+        The results are memoized, as the same CPE records are rated against many certificates.
+
+        :param CPE cpe: CPE to sanitize
+        :return Tuple[str, str]: sanitized title and sanitized item name
+        """
+        if (sanitized := self._sanitized_cpes.get(cpe.uri)) is None:
+            title = (
+                cpe.title
+                if cpe.title
+                else cpe.vendor + " " + cpe.item_name + " " + cpe.version + " " + cpe.update + " " + cpe.target_hw
+            )
+            sanitized = (fully_sanitize_string(title), fully_sanitize_string(cpe.item_name))
+            self._sanitized_cpes[cpe.uri] = sanitized
+        return sanitized
+
     def _compute_best_match(
         self,
         cpe: CPE,
@@ -211,25 +277,14 @@ class CPEClassifier:
         :param bool relax_title: if to relax title or not, defaults to False
         :return float: Maximal value of the four string similarities discussed above.
         """
-        if relax_title:
-            sanitized_title = (
-                fully_sanitize_string(cpe.title)
-                if cpe.title
-                else fully_sanitize_string(
-                    cpe.vendor + " " + cpe.item_name + " " + cpe.version + " " + cpe.update + " " + cpe.target_hw
-                )
-            )
-        else:
-            if cpe.title:
-                sanitized_title = fully_sanitize_string(cpe.title)
-            else:
-                return 0
+        if not relax_title and not cpe.title:
+            return 0
+        sanitized_title, sanitized_item_name = self._sanitize_cpe(cpe)
 
         # Sometimes, sanitization shortens CPE title to very short length. E.g., CPEs in Japanese unicode symbols that get all deteled.
         if len(sanitized_title) < 5:
             return 0
 
-        sanitized_item_name = fully_sanitize_string(cpe.item_name)
         sanitized_cpe_stripped_manufacturer = re.sub(r"\b" + rf"{cpe.vendor}" + r"\b", "", sanitized_title)
         standard_version_product_name = standardize_version_in_cert_name(product_name, versions)
 
@@ -283,23 +338,25 @@ class CPEClassifier:
     def _get_candidate_list_of_vendors(self, manufacturer: str | None) -> set[str]:
         """
         Given manufacturer name, this method will find list of plausible vendors from CPE dataset that are likely related.
+        The results are memoized, as many certificates share the same manufacturer and the prediction is retried
+        several times for each certificate.
 
         :param Optional[str] manufacturer: manufacturer
         :return Set[str]: List of related manufacturers, None if nothing relevant is found.
         """
-        result: set[str] = set()
         if not manufacturer:
-            return result
+            return set()
 
-        splits = re.compile(r"[,/]").findall(manufacturer)
+        if (result := self._candidate_vendors.get(manufacturer)) is None:
+            result = self._compute_candidate_list_of_vendors(manufacturer)
+            self._candidate_vendors[manufacturer] = result
+        return result
 
-        if splits:
-            vendor_tokens = set(
-                itertools.chain.from_iterable([x.strip() for x in manufacturer.split(s)] for s in splits)
-            )
-            result_aux = [self._get_candidate_list_of_vendors(x) for x in vendor_tokens]
-            result_used = set(itertools.chain.from_iterable(x for x in result_aux if x))
-            return result_used if result_used else set()
+    def _compute_candidate_list_of_vendors(self, manufacturer: str) -> set[str]:
+        result: set[str] = set()
+        if VENDOR_SEPARATORS_RE.search(manufacturer):
+            vendor_tokens = {x.strip() for x in VENDOR_SEPARATORS_RE.split(manufacturer)}
+            return set(itertools.chain.from_iterable(self._get_candidate_list_of_vendors(x) for x in vendor_tokens))
 
         if manufacturer in self.vendors_:
             result.add(manufacturer)
@@ -326,7 +383,6 @@ class CPEClassifier:
 
             if not cpe_version:
                 return False
-            just_numbers = r"(\d{1,5})(\.\d{1,5})"
 
             # This assures that on cert version with at least two tokens, we don't match only one-token CPE.
             # E.g. cert with version 7.6 must not match CPE record of version 7
@@ -337,7 +393,7 @@ class CPEClassifier:
             # match too short CPE versions, e.g. `3`
             for v in cert_versions:
                 if (
-                    (simple_startswith(v, cpe_version) and re.search(just_numbers, cpe_version))
+                    (simple_startswith(v, cpe_version) and JUST_NUMBERS_RE.search(cpe_version))
                     or simple_startswith(cpe_version, v)
                 ) and (len(v) < 3 or len(cpe_version) >= 3):
                     return True
@@ -348,13 +404,28 @@ class CPEClassifier:
 
         candidate_vendor_version_pairs: list[tuple[str, str]] = []
         for vendor in cert_candidate_cpe_vendors:
-            viable_cpe_versions = self.vendor_to_versions_.get(vendor, set())
+            viable_cpe_versions = self._get_viable_cpe_versions(vendor, cert_candidate_versions)
             matched_cpe_versions = [
                 x for x in viable_cpe_versions if is_cpe_version_among_cert_versions(x, cert_candidate_versions)
             ]
             candidate_vendor_version_pairs.extend([(vendor, x) for x in matched_cpe_versions])
         return candidate_vendor_version_pairs
 
+    def _get_viable_cpe_versions(self, vendor: str, cert_versions: set[str]) -> set[str]:
+        """
+        Returns versions of the CPE vendor that may match some of the certificate versions. A matching CPE version must
+        share a prefix with some of the certificate versions, so only those starting with the same character are returned.
+
+        :param str vendor: CPE vendor
+        :param Set[str] cert_versions: versions heuristically extracted from the certificate name
+        :return Set[str]: CPE versions of the vendor that shall be checked against the certificate versions
+        """
+        # Empty version is a prefix of anything
+        if "" in cert_versions:
+            return self.vendor_to_versions_.get(vendor, set())
+        versions_by_initial = self._vendor_to_versions_by_initial.get(vendor, {})
+        return set().union(*(versions_by_initial.get(x[0], set()) for x in cert_versions))
+
     def _get_candidate_cpe_matches(self, candidate_vendors: set[str], candidate_versions: set[str]) -> list[CPE]:
         """
         Given List of candidate vendors and candidate versions found in certificate, candidate CPE matches are found
@@ -3,6 +3,8 @@ from __future__ import annotations
 from collections.abc import Callable
 from typing import TypeVar
 
+import networkx as nx
+
 from sec_certs.sample.certificate import Certificate, References
 
 CertSubType = TypeVar("CertSubType", bound=Certificate)
@@ -16,7 +18,7 @@ IDLookupFunc = Callable[[CertSubType], str]
 ReferenceLookupFunc = Callable[[CertSubType], set[str]]
 
 
-# TODO: All of this can and should be rewritten on top of networkx or some other graph library.
+# TODO: The rest of this can and should be rewritten on top of networkx or some other graph library.
 class ReferenceFinder:
     """
     The class assigns references of other certificate instances for each instance.
@@ -27,6 +29,7 @@ class ReferenceFinder:
     def __init__(self: ReferenceFinder) -> None:
         self.references: ReferencesType = {}
         self.id_mapping: IDMapping = {}
+        self._primary_dgst: dict[str, str] = {}
         self._fitted: bool = False
 
     def _create_id_mapping(self, certificates: Certificates, id_func: IDLookupFunc) -> None:
@@ -36,56 +39,49 @@ class ReferenceFinder:
         Necessary for handling duplicates.
         """
         # Create a mapping of certificate ID to certificate digests with that ID.
-        for dgst in certificates:
-            cert_id = id_func(certificates[dgst])
-            c_list = self.id_mapping.setdefault(cert_id, [])
-            c_list.append(dgst)
+        for dgst, cert in certificates.items():
+            self.id_mapping.setdefault(id_func(cert), []).append(dgst)
 
         # Sort digests in ID mapping to have deterministic behavior.
         # The certificate with the first digest will be used with that ID, others will be discarded.
-        for digests in self.id_mapping.values():
+        for cert_id, digests in self.id_mapping.items():
             digests.sort()
+            self._primary_dgst[cert_id] = digests[0]
 
     def _compute_indirect_references(self, referenced_by: ReferencedByDirect) -> ReferencedByIndirect:
         """
-        Compute indirect references via a BFS algorithm.
-        """
-        referenced_by_indirect: ReferencedByIndirect = {}
-
-        # Populate with direct references.
-        certs_id_list = referenced_by.keys()
-        for cert_id in certs_id_list:
-            referenced_by_indirect[cert_id] = set()
-            for item in referenced_by[cert_id]:
-                referenced_by_indirect[cert_id].add(item)
-
-        # Flood in the indirect ones.
-        new_change_detected = True
-        while new_change_detected:
-            new_change_detected = False
-
-            for cert_id in certs_id_list:
-                tmp_referenced_by_indirect_nums = referenced_by_indirect[cert_id].copy()
-                for referencing in tmp_referenced_by_indirect_nums:
-                    if referencing in certs_id_list:
-                        tmp_referencing = referenced_by_indirect[referencing].copy()
-                        newly_discovered_references = [
-                            x for x in tmp_referencing if x not in referenced_by_indirect[cert_id]
-                        ]
-                        referenced_by_indirect[cert_id].update(newly_discovered_references)
-                        if newly_discovered_references:
-                            new_change_detected = True
-        return referenced_by_indirect
+        Compute indirect references as the transitive closure of the direct ones.
+
+        The strongly connected components of the reference graph are condensed into a DAG, which is then processed
+        in reverse topological order, so that every edge is considered just once.
+        """
+        graph = nx.DiGraph()
+        graph.add_edges_from((cert_id, referencing) for cert_id, refs in referenced_by.items() for referencing in refs)
+        condensed = nx.condensation(graph)
+        members = nx.get_node_attributes(condensed, "members")
+
+        reachable: dict[int, set[str]] = {}
+        for component in reversed(list(nx.topological_sort(condensed))):
+            component_reachable: set[str] = set()
+            for successor in condensed.successors(component):
+                component_reachable |= members[successor]
+                component_reachable |= reachable[successor]
+            # Certificates in a reference cycle are (indirectly) referenced by themselves.
+            if len(members[component]) > 1:
+                component_reachable |= members[component]
+            reachable[component] = component_reachable
+
+        mapping = condensed.graph["mapping"]
+        return {cert_id: set(reachable[mapping[cert_id]]) for cert_id in referenced_by}
 
     def _build_referenced_by(
         self, certificates: Certificates, ref_lookup_func: ReferenceLookupFunc
     ) -> tuple[ReferencedByDirect, ReferencedByIndirect]:
         referenced_by: ReferencedByDirect = {}
 
-        for this_cert_id, cert_digests in self.id_mapping.items():
+        for this_cert_id, cert_dgst in self._primary_dgst.items():
             # Take the first certificate digest from the ID mapping (to ensure deterministic behavior and resolve duplicates).
             # TODO: A better approach for handling duplicates in the future would be nice.
-            cert_dgst = cert_digests[0]
             cert_obj = certificates[cert_dgst]
 
             refs = ref_lookup_func(cert_obj)
@@ -97,34 +93,34 @@ class ReferenceFinder:
             for cert_id in refs:
                 if cert_id == this_cert_id:
                     continue
-                referenced_by.setdefault(cert_id, set())
-                referenced_by[cert_id].add(this_cert_id)
+                referenced_by.setdefault(cert_id, set()).add(this_cert_id)
 
         # Now do the indirect ones
         referenced_by_indirect = self._compute_indirect_references(referenced_by)
         return referenced_by, referenced_by_indirect
 
-    def _get_reverse_references(
-        self, cert_id: str, references: ReferencedByDirect | ReferencedByIndirect
-    ) -> set[str] | None:
-        result = set()
-
-        for other_id in references:
-            if cert_id in references[other_id]:
-                result.add(other_id)
-
-        return result if result else None
+    @staticmethod
+    def _invert_references(references: ReferencedByDirect | ReferencedByIndirect) -> dict[str, set[str]]:
+        """
+        Invert the referenced-by mapping, giving for each certificate ID the IDs it is referencing.
+        """
+        inverted: dict[str, set[str]] = {}
+        for other_id, referenced_by in references.items():
+            for cert_id in referenced_by:
+                inverted.setdefault(cert_id, set()).add(other_id)
+        return inverted
 
     def _build_referencing(
         self, referenced_by_direct: ReferencedByDirect, referenced_by_indirect: ReferencedByIndirect
     ) -> None:
-        for cert_id, cert_digests in self.id_mapping.items():
-            cert_dgst = cert_digests[0]
+        referencing_direct = self._invert_references(referenced_by_direct)
+        referencing_indirect = self._invert_references(referenced_by_indirect)
+        for cert_id, cert_dgst in self._primary_dgst.items():
             self.references[cert_dgst] = {
                 "directly_referenced_by": referenced_by_direct.get(cert_id, None),
                 "indirectly_referenced_by": referenced_by_indirect.get(cert_id, None),
-                "directly_referencing": self._get_reverse_references(cert_id, referenced_by_direct),
-                "indirectly_referencing": self._get_reverse_references(cert_id, referenced_by_indirect),
+                "directly_referencing": referencing_direct.get(cert_id, None),
+                "indirectly_referencing": referencing_indirect.get(cert_id, None),
             }
 
     def fit(self, certificates: Certificates, id_func: IDLookupFunc, ref_lookup_func: ReferenceLookupFunc) -> None:
@@ -155,8 +151,7 @@ class ReferenceFinder:
         if not self._fitted:
             return {}
         result = {}
-        for cert_id, digests in self.id_mapping.items():
-            cert_digest = digests[0]
+        for cert_id, cert_digest in self._primary_dgst.items():
             cert_references = self.references[cert_digest]
             direct_refs = cert_references["directly_referencing"]
             if not direct_refs:
@@ -216,9 +211,4 @@ class ReferenceFinder:
         """
         if not self._fitted:
             raise ValueError("Finder not yet fitted")
-        cert_references = {}
-
-        for dgst in dgst_list:
-            cert_references[dgst] = self.predict_single_cert(dgst, keep_unknowns=keep_unknowns)
-
-        return cert_references
+        return {dgst: self.predict_single_cert(dgst, keep_unknowns=keep_unknowns) for dgst in dgst_list}
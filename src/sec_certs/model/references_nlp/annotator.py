@@ -94,8 +94,9 @@ class ReferenceAnnotator:
         df_new = df.copy()
         y_proba = self.predict_proba(df_new.segments)
         df_new["y_proba"] = y_proba
-        df_new["y_pred"] = self.predict(df_new.segments)
-        df_new["correct"] = df_new.apply(
-            lambda row: row["y_pred"] == row["label"] if not pd.isnull(row["label"]) else np.nan, axis=1
-        )
+        # The labels are read off the probabilities, instead of running the model over all the segments again.
+        df_new["y_pred"] = [self._label_mapping[int(np.argmax(x))] for x in y_proba]
+        df_new["correct"] = [
+            y_pred == label if not pd.isnull(label) else np.nan for y_pred, label in zip(df_new.y_pred, df_new.label)
+        ]
         return df_new
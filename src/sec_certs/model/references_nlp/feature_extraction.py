@@ -2,6 +2,7 @@ import itertools
 import logging
 import re
 from collections import Counter
+from collections.abc import Callable
 from pathlib import Path
 from typing import Literal
 
@@ -23,6 +24,7 @@ from sec_certs.model.references_nlp.annotator import ReferenceAnnotator
 from sec_certs.model.references_nlp.annotator_trainer import ReferenceAnnotatorTrainer
 from sec_certs.model.references_nlp.segment_extractor import ReferenceSegmentExtractor
 from sec_certs.utils.nlp import prec_recall_metric
+from sec_certs.utils.strings import compile_alternation
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +34,19 @@ nlp = spacy.load("en_core_web_sm")
 def strip_all(text: str, to_strip) -> str:
     if pd.isna(to_strip):
         return text
-    for i in to_strip:
-        text = text.replace(i, "")
-    return text
+    # The same version sets repeat across rows, so their patterns are compiled once.
+    if (pattern := compile_alternation(frozenset(to_strip))) is None:
+        return text
+    return pattern.sub("", text)
+
+
+def compute_pairwise_similarity(
+    scorer: Callable[[str, str], float], first: pd.Series, second: pd.Series
+) -> list[float]:
+    """
+    Scores the strings of two series pairwise, without the per-row overhead of `DataFrame.apply`.
+    """
+    return [scorer(x, y) for x, y in zip(first, second)]
 
 
 def matches_recertification(segments: list[str]) -> bool:
@@ -227,50 +239,34 @@ def extract_language_features(df: pd.DataFrame, cc_dset: CCDataset) -> pd.DataFr
             referenced_cert_name=lambda df_: df_.canonical_reference_keyword.map(cert_id_to_cert_name),
             cert_versions=lambda df_: df_.dgst.map(dgst_to_extracted_versions),
             referenced_cert_versions=lambda df_: df_.canonical_reference_keyword.map(cert_id_to_extracted_versions),
-            cert_name_stripped_version=lambda df_: df_.apply(
-                lambda x: strip_all(x["cert_name"], x["cert_versions"]), axis=1
-            ),
-            referenced_cert_name_stripped_version=lambda df_: df_.apply(
-                lambda x: strip_all(x["referenced_cert_name"], x["referenced_cert_versions"]),
-                axis=1,
+            cert_name_stripped_version=lambda df_: [strip_all(x, y) for x, y in zip(df_.cert_name, df_.cert_versions)],
+            referenced_cert_name_stripped_version=lambda df_: [
+                strip_all(x, y) for x, y in zip(df_.referenced_cert_name, df_.referenced_cert_versions)
+            ],
+            lang_token_set_ratio=lambda df_: compute_pairwise_similarity(
+                fuzz.token_set_ratio, df_.cert_name_stripped_version, df_.referenced_cert_name_stripped_version
             ),
-            lang_token_set_ratio=lambda df_: df_.apply(
-                lambda x: fuzz.token_set_ratio(
-                    x["cert_name_stripped_version"],
-                    x["referenced_cert_name_stripped_version"],
-                ),
-                axis=1,
+            lang_partial_ratio=lambda df_: compute_pairwise_similarity(
+                fuzz.partial_ratio, df_.cert_name_stripped_version, df_.referenced_cert_name_stripped_version
             ),
-            lang_partial_ratio=lambda df_: df_.apply(
-                lambda x: fuzz.partial_ratio(
-                    x["cert_name_stripped_version"],
-                    x["referenced_cert_name_stripped_version"],
-                ),
-                axis=1,
-            ),
-            lang_token_sort_ratio=lambda df_: df_.apply(
-                lambda x: fuzz.token_sort_ratio(
-                    x["cert_name_stripped_version"],
-                    x["referenced_cert_name_stripped_version"],
-                ),
-                axis=1,
+            lang_token_sort_ratio=lambda df_: compute_pairwise_similarity(
+                fuzz.token_sort_ratio, df_.cert_name_stripped_version, df_.referenced_cert_name_stripped_version
             ),
             lang_n_segments=lambda df_: df_.segments.map(lambda x: len(x) if x else 0),
             lang_matches_recertification=lambda df_: df_.segments.map(matches_recertification),
         )
         .assign(
             lang_n_extracted_versions=lambda df_: df_.cert_versions.map(lambda x: len(x) if x else 0),
-            lang_n_intersection_versions=lambda df_: df_.apply(
-                lambda x: len(set(x["cert_versions"]).intersection(set(x["referenced_cert_versions"]))),
-                axis=1,
-            ),
+            lang_n_intersection_versions=lambda df_: [
+                len(set(x).intersection(set(y))) for x, y in zip(df_.cert_versions, df_.referenced_cert_versions)
+            ],
         )
     )
 
-    df_lang_other_features = df_lang.apply(
-        lambda row: get_lang_features(row["cert_name"], row["referenced_cert_name"]),
-        axis=1,
-    ).apply(pd.Series)
+    df_lang_other_features = pd.DataFrame(
+        [get_lang_features(x, y) for x, y in zip(df_lang.cert_name, df_lang.referenced_cert_name)],
+        index=df_lang.index,
+    )
     lang_features = [
         "common_numeric_words",
         "common_words",
@@ -287,10 +283,7 @@ def extract_language_features(df: pd.DataFrame, cc_dset: CCDataset) -> pd.DataFr
     df_lang_other_features.columns = ["lang_" + x for x in lang_features]
 
     df_lang = pd.concat([df_lang, df_lang_other_features], axis=1).assign(
-        lang_should_not_be_component=lambda df_: df_.apply(
-            lambda x: x.lang_len_difference < 5 and x.lang_token_set_ratio == 100,
-            axis=1,
-        ),
+        lang_should_not_be_component=lambda df_: (df_.lang_len_difference < 5) & (df_.lang_token_set_ratio == 100),
     )
     for col in df_lang.columns:
         if col.startswith("pred_"):
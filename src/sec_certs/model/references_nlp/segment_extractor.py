@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import bisect
 import itertools
 import json
 import logging
 import re
 from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import cache, lru_cache
 from importlib.resources import files
 from pathlib import Path
 from typing import Any, Literal
@@ -16,27 +18,57 @@ import pandas as pd
 import spacy
 
 from sec_certs.sample.cc import CCCertificate
-from sec_certs.sample.cc_certificate_id import CertificateId
+from sec_certs.sample.cc_certificate_id import canonicalize
 from sec_certs.utils import parallel_processing
+from sec_certs.utils.strings import compile_alternation
 
-nlp = spacy.load("en_core_web_sm")
+# Only sentence boundaries are used, and these come from the parser. The parser in en_core_web_sm listens to the shared
+# tok2vec, so tok2vec must stay enabled, while the remaining components can be skipped without changing the segmentation.
+nlp = spacy.load("en_core_web_sm", disable=["tagger", "attribute_ruler", "lemmatizer", "ner"])
 logger = logging.getLogger(__name__)
 
+BRACKET_PATTERN = re.compile(r"\[.+?\]", re.DOTALL)
+
+ACRONYM_REPLACEMENTS = {
+    "TOE": "target of evaluation",
+    "CC": "certification framework",
+    "PP": "protection profile",
+    "ST": "security target",
+    "SFR": "security Functional Requirement",
+    "SFRs": "security Functional Requirements",
+    "IC": "integrated circuit",
+    "MRTD": "machine readable travel document",
+    "TSF": "security functions of target of evaluation",
+    "PACE": "password authenticated connection establishment",
+}
+# All the acronyms are replaced in a single scan of the text, only where they stand as whole whitespace-separated words.
+ACRONYMS_PATTERN = re.compile(r"(?<!\S)(?:" + "|".join(re.escape(x) for x in ACRONYM_REPLACEMENTS) + r")(?!\S)")
+
 
 def swap_and_filter_dict(dct: dict[str, Any], filter_to_keys: set[str]):
     new_dct: dict[str, set[str]] = {}
     for key, val in dct.items():
-        if val in new_dct:
-            new_dct[val].add(key)
-        else:
-            new_dct[val] = {key}
+        if val in filter_to_keys:
+            new_dct.setdefault(val, set()).add(key)
+
+    return {key: frozenset(val) for key, val in new_dct.items()}
+
 
-    return {key: frozenset(val) for key, val in new_dct.items() if key in filter_to_keys}
+@lru_cache(maxsize=8)
+def split_sentences(data: str) -> tuple[str, ...]:
+    """
+    Splits the text into sentences. Records of the same data source often end up with identical processed text, e.g.
+    when no citation identifiers were replaced, so the few most recent results are kept to avoid parsing it again.
+    """
+    return tuple(sent.text for sent in nlp(data).sents)
 
 
-def fill_reference_segments(record: ReferenceRecord, n_sent_before: int = 2, n_sent_after: int = 1) -> ReferenceRecord:
+def fill_reference_segments(
+    record: ReferenceRecord, n_sent_before: int = 2, n_sent_after: int = 1, data: str | None = None
+) -> ReferenceRecord:
     """
     Compute indices of the sentences containing the reference keyword, take their surrounding sentences and join them.
+    The processed data of the record is read from its processed data source unless it is given.
     """
 
     def compute_surroundings(hit_index: int, max_index: int, n_before: int, n_after: int):
@@ -49,47 +81,89 @@ def fill_reference_segments(record: ReferenceRecord, n_sent_before: int = 2, n_s
         upper = min(max_index, hit_index + n_after)
         return range(lower, upper + 1)
 
-    with record.processed_data_source_path.open("r") as handle:
-        data = handle.read()
+    # Scan the sentences for all the keywords in a single pass. Without keywords, no sentence is relevant.
+    if (keywords_pattern := compile_alternation(record.actual_reference_keywords)) is None:
+        record.segments = None
+        return record
 
-    sents = [sent.text for sent in nlp(data).sents]
-    indices_of_relevant_sents = [sents.index(x) for x in sents if any(y in x for y in record.actual_reference_keywords)]
+    if data is None:
+        with record.processed_data_source_path.open("r") as handle:
+            data = handle.read()
+
+    sents = split_sentences(data)
+    # Repeated sentences are attributed to their first occurrence.
+    first_indices: dict[str, int] = {}
+    for index, sent in enumerate(sents):
+        first_indices.setdefault(sent, index)
+    indices_of_relevant_sents = [first_indices[x] for x in sents if keywords_pattern.search(x)]
 
     if not indices_of_relevant_sents:
         record.segments = None
         return record
 
-    sequences_to_take = [
-        compute_surroundings(x, len(sents) - 1, n_sent_before, n_sent_after) for x in indices_of_relevant_sents
-    ]
-    record.segments = {"".join([sents[y] for y in x]) for x in sequences_to_take}
+    # Each window is joined only once, even if the keyword appears in several sentences of the text.
+    sequences_to_take = {
+        compute_surroundings(x, len(sents) - 1, n_sent_before, n_sent_after) for x in set(indices_of_relevant_sents)
+    }
+    record.segments = {"".join(sents[x.start : x.stop]) for x in sequences_to_take}
 
     return record
 
 
-def preprocess_data_source(record: ReferenceRecord) -> ReferenceRecord:
-    # TODO: There's some space for improvement, the preprocessing is acutally run twice.
+def preprocess_data_source(records: list[ReferenceRecord]) -> list[str]:
+    """
+    Preprocesses the data source shared by all the given records. The source is read, has its acronyms replaced and is
+    split into sentences only once, the citation identifiers are then replaced for each of the records.
+    Returns the processed data of each record.
+    """
+    with records[0].raw_data_source_path.open("r") as handle:
+        data = replace_acronyms(handle.read())
+    sents = split_sentences(data)
 
-    with record.raw_data_source_path.open("r") as handle:
-        data = handle.read()
+    processed_data_of_records = []
+    for record in records:
+        processed_data = replace_citation_identifiers(data, record.actual_reference_keywords, sents)
+        processed_data_of_records.append(processed_data)
 
-    processed_data = preprocess_txt_func(data, record.actual_reference_keywords)
+        with record.processed_data_source_path.open("w") as handle:
+            handle.write(processed_data)
 
-    with record.processed_data_source_path.open("w") as handle:
-        handle.write(processed_data)
+    return processed_data_of_records
 
-    return record
+
+def extract_reference_segments(
+    records: list[ReferenceRecord], n_sent_before: int = 2, n_sent_after: int = 1
+) -> list[ReferenceRecord]:
+    """
+    Preprocesses the data source shared by all the given records and fills the segments of each record. The segments
+    are taken from the processed data of the record itself, kept in memory instead of being read back from disk.
+    """
+    for record, processed_data in zip(records, preprocess_data_source(records)):
+        fill_reference_segments(record, n_sent_before, n_sent_after, processed_data)
+    return records
 
 
 def find_bracket_pattern(sentences: set[str], actual_reference_keywords: frozenset[str]):
-    patterns = [r"(\[.+?\])(?=.*" + x + r")" for x in actual_reference_keywords]
+    """
+    For each sentence and keyword, finds the last bracketed identifier that is followed by the keyword somewhere later in
+    the sentence. That is the last bracket ending before the last occurrence of the keyword, so the brackets of each
+    sentence are scanned just once instead of being matched again with a lookahead for every keyword.
+    """
+    flags = re.MULTILINE | re.UNICODE | re.DOTALL
+    # The greedy prefix backtracks from the end of the sentence, so the match ends where the last occurrence starts.
+    last_occurrence_patterns = [(re.compile(r".*(?=" + x + r")", flags), x) for x in actual_reference_keywords]
     res: list[tuple[str, str]] = []
 
     for sent in sentences:
-        for pattern, keyword in zip(patterns, actual_reference_keywords):
-            matches = re.findall(pattern, sent, flags=re.MULTILINE | re.UNICODE | re.DOTALL)
-            if matches:
-                res.append((matches[-1], keyword))
+        brackets = [(m.end(), m.group()) for m in BRACKET_PATTERN.finditer(sent)]
+        if not brackets:
+            continue
+        bracket_ends = [end for end, _ in brackets]
+        for pattern, keyword in last_occurrence_patterns:
+            if last_occurrence := pattern.match(sent):
+                n_preceding_brackets = bisect.bisect_right(bracket_ends, last_occurrence.end())
+                if n_preceding_brackets:
+                    res.append((brackets[n_preceding_brackets - 1][1], keyword))
     return res
 
 
@@ -99,33 +173,26 @@ def preprocess_txt_func(data: str, actual_reference_keywords: frozenset[str]) ->
     return data
 
 
-def replace_citation_identifiers(data: str, actual_reference_keywords: frozenset[str]) -> str:
-    segments = {sent.text for sent in nlp(data).sents if any(x in sent.text for x in actual_reference_keywords)}
-    patterns_to_replace = find_bracket_pattern(segments, actual_reference_keywords)
-    for x in patterns_to_replace:
-        data = data.replace(x[0], x[1])
-    return data
+def replace_citation_identifiers(
+    data: str, actual_reference_keywords: frozenset[str], sents: tuple[str, ...] | None = None
+) -> str:
+    if (keywords_pattern := compile_alternation(actual_reference_keywords)) is None:
+        return data
+    if sents is None:
+        sents = split_sentences(data)
+    segments = {sent for sent in sents if keywords_pattern.search(sent)}
+    replacements: dict[str, str] = {}
+    for identifier, keyword in find_bracket_pattern(segments, actual_reference_keywords):
+        replacements.setdefault(identifier, keyword)
+    # Replace all the identifiers in a single pass, longest first, so that an identifier nested in another one is not
+    # replaced on its own.
+    if (pattern := compile_alternation(frozenset(replacements))) is None:
+        return data
+    return pattern.sub(lambda m: replacements[m.group()], data)
 
 
 def replace_acronyms(text: str) -> str:
-    acronym_replacements = {
-        "TOE": "target of evaluation",
-        "CC": "certification framework",
-        "PP": "protection profile",
-        "ST": "security target",
-        "SFR": "security Functional Requirement",
-        "SFRs": "security Functional Requirements",
-        "IC": "integrated circuit",
-        "MRTD": "machine readable travel document",
-        "TSF": "security functions of target of evaluation",
-        "PACE": "password authenticated connection establishment",
-    }
-
-    for acronym, replacement in acronym_replacements.items():
-        pattern = rf"(?<!\S){re.escape(acronym)}(?!\S)"
-        text = re.sub(pattern, replacement, text)
-
-    return text
+    return ACRONYMS_PATTERN.sub(lambda m: ACRONYM_REPLACEMENTS[m.group()], text)
 
 
 @dataclass
@@ -195,8 +262,9 @@ class ReferenceSegmentExtractor:
 
             canonical_references = getattr(cert.heuristics, canonical_ref_var[source]).directly_referencing
             actual_references = getattr(cert.pdf_data, actual_ref_var[source])["cc_cert_id"]
+            # The same certificate ids are referenced by many certificates, canonicalize memoizes them across these.
             actual_references = {
-                inner_key: CertificateId(outer_key, inner_key).canonical
+                inner_key: canonicalize(inner_key, outer_key)
                 for outer_key, val in actual_references.items()
                 for inner_key in val
             }
@@ -224,23 +292,20 @@ class ReferenceSegmentExtractor:
     def _build_df(self, certs: list[CCCertificate], source: Literal["target", "report"]) -> pd.DataFrame:
         records = self._build_records(certs, source)
 
-        records = parallel_processing.process_parallel(
-            preprocess_data_source,
-            records,
-            use_threading=False,
-            progress_bar=True,
-            progress_bar_desc="Preprocessing data",
-        )
-        records_with_args = [(x, self.n_sents_before, self.n_sents_after) for x in records]
+        # Records of the same certificate share their data source, so each source is preprocessed just once.
+        records_by_source: dict[Path, list[ReferenceRecord]] = {}
+        for record in records:
+            records_by_source.setdefault(record.raw_data_source_path, []).append(record)
 
-        results = parallel_processing.process_parallel(
-            fill_reference_segments,
-            records_with_args,
+        processed_records = parallel_processing.process_parallel(
+            extract_reference_segments,
+            [(x, self.n_sents_before, self.n_sents_after) for x in records_by_source.values()],
             unpack=True,
             use_threading=False,
             progress_bar=True,
             progress_bar_desc="Recovering reference segments",
         )
+        results = list(itertools.chain.from_iterable(processed_records))
 
         print(f"I now have {len(results)} in {source} mode")
         return pd.DataFrame.from_records(
@@ -255,9 +320,11 @@ class ReferenceSegmentExtractor:
         )
 
     @staticmethod
+    @cache
     def _get_split_dict() -> dict[str, str]:
         """
-        Returns dictionary that maps dgst: split, where split in `train`, `valid`, `test`
+        Returns dictionary that maps dgst: split, where split in `train`, `valid`, `test`. The packaged split files do
+        not change, so they are read only once and the same (read-only) dictionary is returned on subsequent calls.
         """
 
         def get_single_dct(pth: Path, split_name: str) -> dict[str, str]:
@@ -272,9 +339,11 @@ class ReferenceSegmentExtractor:
         }
 
     @staticmethod
+    @cache
     def _get_annotations_dict() -> dict[tuple[str, str], str]:
         """
-        Returns dictionary mapping tuples `(dgst, canonical_reference_keyword) -> label`
+        Returns dictionary mapping tuples `(dgst, canonical_reference_keyword) -> label`. The packaged annotations are
+        parsed only once and the same (read-only) dictionary is returned on subsequent calls.
         """
 
         def load_single_df(pth: Path, split_name: str) -> pd.DataFrame:
@@ -314,11 +383,11 @@ class ReferenceSegmentExtractor:
 
     @staticmethod
     def _process_df(df: pd.DataFrame, certs: Iterable[CCCertificate]) -> pd.DataFrame:
-        def process_segment(segment: str, actual_reference_keywords: frozenset[str]) -> str:
+        def process_segment(segment: str, keywords_pattern: re.Pattern | None) -> str:
             segment = " ".join(segment.split())
-            for ref_id in actual_reference_keywords:
-                segment = segment.replace(ref_id, "REFERENCED_CERTIFICATE_ID")
-            return segment
+            if keywords_pattern is None:
+                return segment
+            return keywords_pattern.sub("REFERENCED_CERTIFICATE_ID", segment)
 
         def unique_elements(series):
             combined = [item for sublist in series for item in sublist]
@@ -329,17 +398,16 @@ class ReferenceSegmentExtractor:
         """
         annotations_dict = ReferenceSegmentExtractor._get_annotations_dict()
         split_dct = ReferenceSegmentExtractor._get_split_dict()
-        logger.info(f"Deleting {df.loc[df.segments.isnull()].shape[0]} rows with no segments.")
+        no_segments = df.segments.isnull()
+        logger.info(f"Deleting {no_segments.sum()} rows with no segments.")
 
-        df_new = df.copy()
-        df_new["full_key"] = df_new.apply(lambda x: (x["dgst"], x["canonical_reference_keyword"]), axis=1)
-        to_delete = len(df_new.loc[df_new.segments.isnull()].full_key.unique())
+        to_delete = df.loc[no_segments].groupby(["dgst", "canonical_reference_keyword"], dropna=False).ngroups
         print(
             f"Deleting records for {to_delete} unique (dgst, referenced_id) pairs, not necessarily labeled ones. These have empty segments."
         )
 
         df_processed = (
-            df.loc[df.segments.notnull()]
+            df.loc[~no_segments]
             .explode("segments")
             # .assign(lang=lambda df_: df_.segments.map(langdetect.detect))
             # .loc[lambda df_: df_.lang.isin({"en", "fr", "de"})]  # This could get disabled possibly.
@@ -349,20 +417,19 @@ class ReferenceSegmentExtractor:
                 dropna=False,
             )
             .agg({"segments": list, "actual_reference_keywords": unique_elements})
-            .assign(
-                actual_reference_keywords=lambda df_: df_.actual_reference_keywords.map(list),
-                label=lambda df_: [
-                    annotations_dict.get(x) for x in zip(df_["dgst"], df_["canonical_reference_keyword"])
-                ],
-                split=lambda df_: df_.dgst.map(split_dct),
-            )
-            .assign(
-                label=lambda df_: df_.label.map(lambda x: x if x is not None else np.nan),
-                split=lambda df_: df_.split.map(lambda x: "test" if pd.isnull(x) else x),
-            )
         )
-        df_processed.segments = df_processed.apply(
-            lambda row: [process_segment(x, row.actual_reference_keywords) for x in row.segments],
-            axis=1,
+        # All derived columns are assigned at once to avoid materializing intermediate frames.
+        labels = (annotations_dict.get(x) for x in zip(df_processed.dgst, df_processed.canonical_reference_keyword))
+        splits = (split_dct.get(x) for x in df_processed.dgst)
+        return df_processed.assign(
+            segments=[
+                [process_segment(x, keywords_pattern) for x in segments]
+                for segments, keywords_pattern in zip(
+                    df_processed.segments,
+                    (compile_alternation(frozenset(x)) for x in df_processed.actual_reference_keywords),
+                )
+            ],
+            actual_reference_keywords=df_processed.actual_reference_keywords.map(list),
+            label=[x if x is not None else np.nan for x in labels],
+            split=["test" if pd.isnull(x) else x for x in splits],
         )
-        return df_processed
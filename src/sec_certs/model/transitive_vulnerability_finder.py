@@ -39,25 +39,40 @@ class TransitiveVulnerabilityFinder:
     def __init__(self, id_func: IDLookupFunc):
         self.vulnerabilities: Vulnerabilities = {}
         self.certificates: Certificates = {}
+        self._cert_ids: dict[str, str] = {}
         self._cert_id_counter: Counter = Counter()
+        self._cert_id_to_cves: dict[str, set[str]] = {}
         self._fitted = False
         self._id_func: IDLookupFunc = id_func
 
     def _clear_state(self) -> None:
         self.vulnerabilities = {}
         self.certificates = {}
+        self._cert_ids = {}
         self._cert_id_counter = Counter()
+        self._cert_id_to_cves = {}
 
-    def _fill_dataset_cert_ids_counter(self) -> None:
-        self._cert_id_counter = Counter([self._id_func(x) for x in self.certificates.values()])
+    def _fill_dataset_cert_ids(self) -> None:
+        """
+        Look up the certificate ID of each certificate once, it is needed by all the later passes.
+        """
+        self._cert_ids = {dgst: self._id_func(cert) for dgst, cert in self.certificates.items()}
+        self._cert_id_counter = Counter(self._cert_ids.values())
 
-    def _get_cert_transitive_cves(
-        self, cert: CertSubType, reference_type: ReferenceType, ref_func: ReferenceLookupFunc
-    ) -> set[str] | None:
+    def _fill_cert_id_to_cves_index(self) -> None:
+        """
+        Index related CVEs by certificate ID once, so that resolving a reference is a single lookup
+        instead of a scan over all certificates.
+        """
+        for dgst, cert in self.certificates.items():
+            if cves := cert.heuristics.related_cves:
+                self._cert_id_to_cves.setdefault(self._cert_ids[dgst], set()).update(cves)
+
+    def _get_cert_transitive_cves(self, cert_references: References, reference_type: ReferenceType) -> set[str] | None:
         references = (
-            ref_func(cert).directly_referenced_by
+            cert_references.directly_referenced_by
             if reference_type == ReferenceType.DIRECT
-            else ref_func(cert).indirectly_referenced_by
+            else cert_references.indirectly_referenced_by
         )
 
         if not references:
@@ -69,10 +84,8 @@ class TransitiveVulnerabilityFinder:
             if self._cert_id_counter[cert_id] != 1:
                 continue
 
-            for cert in self.certificates.values():
-                cves = cert.heuristics.related_cves
-                if self._id_func(cert) == cert_id and cves:
-                    vulnerabilities.update(cves)
+            if cves := self._cert_id_to_cves.get(cert_id):
+                vulnerabilities.update(cves)
 
         return vulnerabilities if vulnerabilities else None
 
@@ -85,12 +98,13 @@ class TransitiveVulnerabilityFinder:
         """
         self._clear_state()
         self.certificates = certificates
-        self._fill_dataset_cert_ids_counter()
+        self._fill_dataset_cert_ids()
+        self._fill_cert_id_to_cves_index()
 
         thrown_away_cert_counter = 0
 
-        for cert in self.certificates.values():
-            cert_id = self._id_func(cert)
+        for dgst, cert in self.certificates.items():
+            cert_id = self._cert_ids[dgst]
 
             if not cert_id:
                 continue
@@ -98,12 +112,13 @@ class TransitiveVulnerabilityFinder:
                 thrown_away_cert_counter += 1
                 continue
 
+            cert_references = ref_func(cert)
             self.vulnerabilities[cert.dgst] = {}
             self.vulnerabilities[cert.dgst][ReferenceType.DIRECT.value] = self._get_cert_transitive_cves(
-                cert, ReferenceType.DIRECT, ref_func
+                cert_references, ReferenceType.DIRECT
             )
             self.vulnerabilities[cert.dgst][ReferenceType.INDIRECT.value] = self._get_cert_transitive_cves(
-                cert, ReferenceType.INDIRECT, ref_func
+                cert_references, ReferenceType.INDIRECT
             )
 
         if thrown_away_cert_counter > 0:
@@ -141,9 +156,4 @@ class TransitiveVulnerabilityFinder:
         if not self._fitted:
             raise ValueError("Finder not yet fitted")
 
-        cert_vulnerabilities = {}
-
-        for dgst in dgst_list:
-            cert_vulnerabilities[dgst] = self.predict_single_cert(dgst)
-
-        return cert_vulnerabilities
+        return {dgst: self.predict_single_cert(dgst) for dgst in dgst_list}
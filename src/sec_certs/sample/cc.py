@@ -17,7 +17,13 @@ from bs4 import Tag
 import sec_certs.utils.extract
 import sec_certs.utils.pdf
 from sec_certs import constants
-from sec_certs.cert_rules import SARS_IMPLIED_FROM_EAL, cc_rules, rules, security_level_csv_scan
+from sec_certs.cert_rules import (
+    SARS_IMPLIED_FROM_EAL,
+    cc_cert_id_patterns,
+    cc_filename_cert_id_patterns,
+    cc_rules,
+    security_level_csv_scan,
+)
 from sec_certs.configuration import config
 from sec_certs.sample.cc_certificate_id import CertificateId, canonicalize, schemes
 from sec_certs.sample.certificate import Certificate, References, logger
@@ -191,7 +197,7 @@ class CCCertificate(
             if not self.report_frontpage:
                 return None
             labs = [
-                data["cert_lab"].split(" ")[0].upper()
+                data["cert_lab"].partition(" ")[0].upper()
                 for scheme, data in self.report_frontpage.items()
                 if data and "cert_lab" in data
             ]
@@ -216,7 +222,7 @@ class CCCertificate(
             """
             Get cert_id candidates from the matches in the report filename and cert filename.
             """
-            scheme_filename_rules = rules["cc_filename_cert_id"][scheme]
+            scheme_filename_rules = cc_filename_cert_id_patterns[scheme]
             if not scheme_filename_rules:
                 return {}
             scheme_meta = schemes[scheme]
@@ -227,7 +233,7 @@ class CCCertificate(
 
                 matches: Counter = Counter()
                 for rule in scheme_filename_rules:
-                    match = re.search(rule, fname)
+                    match = rule.search(fname)
                     if match:
                         try:
                             meta = match.groupdict()
@@ -240,8 +246,7 @@ class CCCertificate(
                 total = max(matches.values())
 
                 for candidate, count in matches.items():
-                    results.setdefault(candidate, 0)
-                    results[candidate] += count / total
+                    results[candidate] = results.get(candidate, 0) + count / total
             # TODO count length in weight
             return results
 
@@ -265,8 +270,7 @@ class CCCertificate(
                 total = max(matches.values())
 
                 for candidate, count in matches.items():
-                    results.setdefault(candidate, 0)
-                    results[candidate] += count / total
+                    results[candidate] = results.get(candidate, 0) + count / total
             # TODO count length in weight
             return results
 
@@ -274,7 +278,7 @@ class CCCertificate(
             """
             Get cert_id candidates from the report metadata.
             """
-            scheme_rules = rules["cc_cert_id"][scheme]
+            scheme_rules = cc_cert_id_patterns[scheme]
             fields = ("/Title", "/Subject")
             results: dict[str, float] = {}
             for metadata in (self.report_metadata, self.cert_metadata):
@@ -286,7 +290,7 @@ class CCCertificate(
                     if not field_val:
                         continue
                     for rule in scheme_rules:
-                        match = re.search(rule, field_val)
+                        match = rule.search(field_val)
                         if match:
                             cert_id = normalize_match_string(match.group())
                             matches[cert_id] += 1
@@ -295,43 +299,31 @@ class CCCertificate(
                 total = max(matches.values())
 
                 for candidate, count in matches.items():
-                    results.setdefault(candidate, 0)
-                    results[candidate] += count / total
+                    results[candidate] = results.get(candidate, 0) + count / total
             # TODO count length in weight
             return results
 
         def candidate_cert_ids(self, scheme: str) -> dict[str, float]:
-            frontpage_id = self.frontpage_cert_id(scheme)
-            metadata_id = self.metadata_cert_id(scheme)
-            filename_id = self.filename_cert_id(scheme)
-            keywords_id = self.keywords_cert_id(scheme)
+            # Each source is normalized with weights from 0 to 1 (if anything is returned), paired with its weight.
+            weighted_sources = (
+                (self.frontpage_cert_id(scheme), 1.5),
+                (self.metadata_cert_id(scheme), 1.2),
+                (self.keywords_cert_id(scheme), 1.0),
+                (self.filename_cert_id(scheme), 1.0),
+            )
 
-            # Join them and weigh them, each is normalized with weights from 0 to 1 (if anything is returned)
+            # Join them and weigh them.
             candidates: dict[str, float] = defaultdict(lambda: 0.0)
             # TODO: Add heuristic based on ordering of ids (and extracted year + increment)
             # TODO: Add heuristic based on length
             # TODO: Add heuristic based on id "richness", we want to prefer IDs that have more components.
             # If we cannot canonicalize, just skip that ID.
-            for candidate, count in frontpage_id.items():
-                try:
-                    candidates[canonicalize(candidate, scheme)] += count * 1.5
-                except Exception:
-                    continue
-            for candidate, count in metadata_id.items():
-                try:
-                    candidates[canonicalize(candidate, scheme)] += count * 1.2
-                except Exception:
-                    continue
-            for candidate, count in keywords_id.items():
-                try:
-                    candidates[canonicalize(candidate, scheme)] += count * 1.0
-                except Exception:
-                    continue
-            for candidate, count in filename_id.items():
-                try:
-                    candidates[canonicalize(candidate, scheme)] += count * 1.0
-                except Exception:
-                    continue
+            for source_ids, weight in weighted_sources:
+                for candidate, count in source_ids.items():
+                    try:
+                        candidates[canonicalize(candidate, scheme)] += count * weight
+                    except Exception:
+                        continue
             return candidates
 
     @dataclass
@@ -560,13 +552,13 @@ class CCCertificate(
         html_preferred_attrs = {"protection_profiles", "maintenance_updates", "cert_link", "report_link", "st_link"}
 
         for att, val in vars(self).items():
+            other_val = getattr(other, att)
             if (not val) or (other_source == "html" and att in html_preferred_attrs) or (att == "state"):
-                setattr(self, att, getattr(other, att))
-            else:
-                if getattr(self, att) != getattr(other, att):
-                    logger.warning(
-                        f"When merging certificates with dgst {self.dgst}, the following mismatch occured: Attribute={att}, self[{att}]={getattr(self, att)}, other[{att}]={getattr(other, att)}"
-                    )
+                setattr(self, att, other_val)
+            elif val is not other_val and val != other_val:
+                logger.warning(
+                    f"When merging certificates with dgst {self.dgst}, the following mismatch occured: Attribute={att}, self[{att}]={val}, other[{att}]={other_val}"
+                )
 
     @classmethod
     def from_dict(cls, dct: dict) -> CCCertificate:
@@ -658,7 +650,8 @@ class CCCertificate(
     def _html_row_get_maintenance_div(cell: Tag) -> Tag | None:
         divs = cell.find_all("div")
         for d in divs:
-            if d.find("div") and d.stripped_strings and list(d.stripped_strings)[0] == "Maintenance Report(s)":
+            # Only the first string is needed, so do not collect all strings of every div in the cell.
+            if next(d.stripped_strings, None) == "Maintenance Report(s)" and d.find("div"):
                 return d
         return None
 
@@ -667,16 +660,17 @@ class CCCertificate(
         possible_updates = list(main_div.find_all("li"))
         maintenance_updates = set()
         for u in possible_updates:
-            text = list(u.stripped_strings)[0]
-            main_date = datetime.strptime(text.split(" ")[0], "%Y-%m-%d").date() if text else None
+            text = next(u.stripped_strings, "")
+            main_date = datetime.strptime(text.partition(" ")[0], "%Y-%m-%d").date() if text else None
             main_title = text.split("– ")[1]
             main_report_link = None
             main_st_link = None
             links = u.find_all("a")
             for link in links:
-                if link.get("title").startswith("Maintenance Report:"):
+                title = link.get("title")
+                if title.startswith("Maintenance Report:"):
                     main_report_link = CCCertificate.cc_url + link.get("href")
-                elif link.get("title").startswith("Maintenance ST"):
+                elif title.startswith("Maintenance ST"):
                     main_st_link = CCCertificate.cc_url + link.get("href")
                 else:
                     logger.error("Unknown link in Maintenance part!")
@@ -747,18 +741,20 @@ class CCCertificate(
         :param Optional[Union[str, Path]] st_txt_dir: Directory where txt security targets shall be stored
         :param Optional[Union[str, Path]] cert_txt_dir: Directory where txtcertificates shall be stored
         """
+        pdf_name = self.dgst + ".pdf"
+        txt_name = self.dgst + ".txt"
         if report_pdf_dir:
-            self.state.report.pdf_path = Path(report_pdf_dir) / (self.dgst + ".pdf")
+            self.state.report.pdf_path = Path(report_pdf_dir) / pdf_name
         if st_pdf_dir:
-            self.state.st.pdf_path = Path(st_pdf_dir) / (self.dgst + ".pdf")
+            self.state.st.pdf_path = Path(st_pdf_dir) / pdf_name
         if cert_pdf_dir:
-            self.state.cert.pdf_path = Path(cert_pdf_dir) / (self.dgst + ".pdf")
+            self.state.cert.pdf_path = Path(cert_pdf_dir) / pdf_name
         if report_txt_dir:
-            self.state.report.txt_path = Path(report_txt_dir) / (self.dgst + ".txt")
+            self.state.report.txt_path = Path(report_txt_dir) / txt_name
         if st_txt_dir:
-            self.state.st.txt_path = Path(st_txt_dir) / (self.dgst + ".txt")
+            self.state.st.txt_path = Path(st_txt_dir) / txt_name
         if cert_txt_dir:
-            self.state.cert.txt_path = Path(cert_txt_dir) / (self.dgst + ".txt")
+            self.state.cert.txt_path = Path(cert_txt_dir) / txt_name
 
     @staticmethod
     def download_pdf_report(cert: CCCertificate) -> CCCertificate:
@@ -780,7 +776,7 @@ class CCCertificate(
         else:
             cert.state.report.download_ok = True
             cert.state.report.pdf_hash = helpers.get_sha256_filepath(cert.state.report.pdf_path)
-            cert.pdf_data.report_filename = unquote_plus(str(urlparse(cert.report_link).path).split("/")[-1])
+            cert.pdf_data.report_filename = unquote_plus(str(urlparse(cert.report_link).path).rpartition("/")[2])
         return cert
 
     @staticmethod
@@ -804,7 +800,7 @@ class CCCertificate(
         else:
             cert.state.st.download_ok = True
             cert.state.st.pdf_hash = helpers.get_sha256_filepath(cert.state.st.pdf_path)
-            cert.pdf_data.st_filename = unquote_plus(str(urlparse(cert.st_link).path).split("/")[-1])
+            cert.pdf_data.st_filename = unquote_plus(str(urlparse(cert.st_link).path).rpartition("/")[2])
         return cert
 
     @staticmethod
@@ -828,7 +824,7 @@ class CCCertificate(
         else:
             cert.state.cert.download_ok = True
             cert.state.cert.pdf_hash = helpers.get_sha256_filepath(cert.state.cert.pdf_path)
-            cert.pdf_data.cert_filename = unquote_plus(str(urlparse(cert.cert_link).path).split("/")[-1])
+            cert.pdf_data.cert_filename = unquote_plus(str(urlparse(cert.cert_link).path).rpartition("/")[2])
         return cert
 
     @staticmethod
@@ -1003,6 +999,15 @@ class CCCertificate(
             cert.pdf_data.cert_keywords = cert_keywords
         return cert
 
+    @staticmethod
+    def cert_id_version_stem(cert_id: CertificateId) -> dict[str, Any]:
+        """
+        Returns the components of the cert ID that have to match for two cert IDs to be versions of the same certificate.
+        """
+        # For German certs we want to also ignore the year in comparison.
+        ignored = {"version", "year"} if cert_id.scheme == "DE" else {"version"}
+        return {key: value for key, value in cert_id.meta.items() if key not in ignored}
+
     def compute_heuristics_cert_versions(self, cert_ids: dict[str, CertificateId | None]) -> None:  # noqa: C901
         """
         Fills in the previous and next certificate versions based on the cert ID.
@@ -1016,6 +1021,7 @@ class CCCertificate(
             # There is no version in the cert_id, so skip it
             return
         version = own.meta.get("version")
+        own_stem = self.cert_id_version_stem(own)
         for other_dgst, other in cert_ids.items():
             if other_dgst == self.dgst:
                 # Skip ourselves
@@ -1026,12 +1032,7 @@ class CCCertificate(
             other_version = other.meta.get("version")
             # Go over the own meta and compare, if some field other than version is different, bail out.
             # If all except the version are the same, we have a match.
-            for key, value in own.meta.items():
-                if key == "version":
-                    continue
-                if self.scheme == "DE" and key == "year":
-                    # For German certs we want to also ignore the year in comparison.
-                    continue
+            for key, value in own_stem.items():
                 if value != other.meta.get(key):
                     break
             else:
@@ -1080,6 +1081,6 @@ class CCCertificate(
 
         if candidates:
             max_weight = max(candidates.values())
-            max_candidates = list(filter(lambda x: candidates[x] == max_weight, candidates.keys()))
+            max_candidates = [x for x, weight in candidates.items() if weight == max_weight]
             max_candidates.sort(key=len, reverse=True)
             self.heuristics.cert_id = max_candidates[0]
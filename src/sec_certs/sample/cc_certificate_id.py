@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import re
+import sys
 from dataclasses import dataclass
-from functools import cached_property
+from functools import cache, cached_property
 
-from sec_certs.cert_rules import rules
+from sec_certs.cert_rules import cc_cert_id_patterns
 
 
 def _parse_year(year: str | None) -> int | None:
@@ -232,8 +232,8 @@ class CertificateId:
 
     @cached_property
     def meta(self):
-        for rule in rules["cc_cert_id"][self.scheme]:
-            if match := re.match(rule, self.clean):
+        for pattern in cc_cert_id_patterns[self.scheme]:
+            if match := pattern.match(self.clean):
                 return match.groupdict()
         return {}
 
@@ -244,7 +244,7 @@ class CertificateId:
         """
         return self.raw.replace("\N{HYPHEN}", "-").strip()
 
-    @property
+    @cached_property
     def canonical(self) -> str:
         """
         The canonical version of this certificate id.
@@ -270,5 +270,7 @@ class CertificateId:
         return self.canonical == other.canonical and self.scheme == other.scheme
 
 
+@cache
 def canonicalize(cert_id_str: str, scheme: str) -> str:
-    return CertificateId(scheme, cert_id_str).canonical
+    # Canonical IDs are used as keys all over the reference computation, intern them to share one object per ID.
+    return sys.intern(CertificateId(scheme, cert_id_str).canonical)
@@ -118,10 +118,8 @@ def _get_hash(url: str, session=None, **kwargs) -> str | None:
         resp = _get(url, session, **kwargs)
     except (HTTPError, ConnectionError):
         return None
-    h = hashlib.sha256()
-    for chunk in resp.iter_content():
-        h.update(chunk)
-    return h.digest().hex()
+    # The response is not streamed, so its content is already in memory. Iterating over it would go byte by byte.
+    return hashlib.sha256(resp.content).digest().hex()
 
 
 def get_australia_in_evaluation(  # noqa: C901
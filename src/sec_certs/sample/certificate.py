@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import copy
 import logging
 from abc import ABC, abstractmethod
 from collections import ChainMap
@@ -78,9 +77,10 @@ class Certificate(Generic[T, H, P], ABC, ComplexSerializableType):
         return self.dgst == other.dgst
 
     def to_dict(self) -> dict[str, Any]:
+        serialized_attributes = set(self.serialized_attributes)
         return {
             **{"dgst": self.dgst},
-            **{key: val for key, val in copy.deepcopy(self.__dict__).items() if key in self.serialized_attributes},
+            **{key: val for key, val in self.__dict__.items() if key in serialized_attributes},
         }
 
     @classmethod
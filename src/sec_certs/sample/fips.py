@@ -111,10 +111,8 @@ class FIPSHTMLParser:
         for m in re.finditer(r_key, caveat):
             if m.group("word") and m.group("word").lower() in {"rsa", "shs", "dsa", "pkcs", "aes"}:
                 continue
-            if m.group("id") in ids_found:
-                ids_found[m.group("id")] += 1
-            else:
-                ids_found[m.group("id")] = 1
+            cert_id = m.group("id")
+            ids_found[cert_id] = ids_found.get(cert_id, 0) + 1
         return ids_found
 
     @staticmethod
@@ -632,7 +630,7 @@ class FIPSCertificate(
         return cert
 
     @staticmethod
-    def get_algorithms_from_policy_tables(cert: FIPSCertificate):
+    def get_algorithms_from_policy_tables(cert: FIPSCertificate) -> FIPSCertificate:
         """
         Retrieves IDs of algorithms from tables inside security policy pdfs.
         External library is used to handle this.
@@ -653,6 +651,7 @@ class FIPSCertificate(
             except Exception as e:
                 logger.warning(f"Error when parsing tables from {cert.dgst}: {e}")
                 cert.state.policy_extract_ok = False
+        return cert
 
     def prune_referenced_cert_ids(self) -> None:
         """
@@ -661,11 +660,11 @@ class FIPSCertificate(
         heuristics.prunned_module_references and heuristics.prunned_policy_references. These variables are further
         processed and Reference objects are created from them.
         """
-        html_module_ids = set(self.web_data.mentioned_certs.keys()) if self.web_data.mentioned_certs else set()
+        html_module_ids = set(self.web_data.mentioned_certs) if self.web_data.mentioned_certs else set()
         self.heuristics.module_prunned_references = self._prune_reference_ids_variable(html_module_ids)
 
         if self.pdf_data.keywords:
-            pdf_policy_ids = set(self.pdf_data.keywords["fips_cert_id"].get("Cert", {}).keys())
+            pdf_policy_ids = set(self.pdf_data.keywords["fips_cert_id"].get("Cert", {}))
             pdf_policy_ids = {"".join([y for y in x if y.isdigit()]) for x in pdf_policy_ids}
         else:
             pdf_policy_ids = set()
@@ -31,7 +31,7 @@ class MIPStatus(Enum):
 
     def __lt__(self, other):
         if self.__class__ == other.__class__:
-            mb = list(MIPStatus.__members__.keys())
+            mb = list(MIPStatus.__members__)
             return mb.index(self.name) < mb.index(other.name)
         raise NotImplementedError
 
@@ -19,6 +19,7 @@ SAR_CLASS_MAPPING = {
 }
 
 SAR_CLASSES = set(SAR_CLASS_MAPPING)
+SAR_RE = re.compile("(?:" + "|".join(SAR_CLASS_MAPPING) + ")(?:_[A-Z]{3,4}){1,2}(?:\\.[0-9]){0,2}")
 SAR_DICT_KEY = "cc_sar"
 
 
@@ -29,7 +30,7 @@ class SAR(ComplexSerializableType):
 
     @property
     def assurance_class(self):
-        return SAR_CLASS_MAPPING.get(self.family.split("_")[0], None)
+        return SAR_CLASS_MAPPING.get(self.family.partition("_")[0], None)
 
     @classmethod
     def from_string(cls, string: str) -> SAR:
@@ -37,19 +38,16 @@ class SAR(ComplexSerializableType):
             raise ValueError("SAR misses level integer")
         if not cls.matches_re(string):
             raise ValueError("SAR does not match any regular expression")
-        family = string.split(".")[0]
-        level = int(string.split(".")[1])
-        return cls(family, level)
+        family, level, *_ = string.split(".")
+        return cls(family, int(level))
 
     @staticmethod
     def contains_level(string: str) -> bool:
-        return len(string.split(".")) != 1
+        return "." in string
 
     @staticmethod
     def matches_re(string: str) -> bool:
-        return any(
-            re.match(sar_class + "(?:_[A-Z]{3,4}){1,2}(?:\\.[0-9]){0,2}", string) for sar_class in SAR_CLASS_MAPPING
-        )
+        return SAR_RE.match(string) is not None
 
     def __lt__(self, other: Any) -> bool:
         if not isinstance(other, SAR):
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import copy
 import gzip
 import json
 from collections.abc import Callable
@@ -30,14 +29,14 @@ class ComplexSerializableType:
     def serialized_attributes(self) -> list[str]:
         if hasattr(self, "__slots__") and self.__slots__:
             return list(self.__slots__)
-        return list(self.__dict__.keys())
+        return list(self.__dict__)
 
     def to_dict(self) -> dict[str, Any]:
+        # Values are not deep-copied, callers that need to mutate them shall copy them on their own.
+        serialized_attributes = set(self.serialized_attributes)
         if hasattr(self, "__slots__") and self.__slots__:
-            return {
-                key: copy.deepcopy(getattr(self, key)) for key in self.__slots__ if key in self.serialized_attributes
-            }
-        return {key: val for key, val in copy.deepcopy(self.__dict__).items() if key in self.serialized_attributes}
+            return {key: getattr(self, key) for key in self.__slots__ if key in serialized_attributes}
+        return {key: val for key, val in self.__dict__.items() if key in serialized_attributes}
 
     @classmethod
     def from_dict(cls: type[T], dct: dict) -> T:
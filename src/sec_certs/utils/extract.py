@@ -1,31 +1,83 @@
 from __future__ import annotations
 
+import itertools
 import logging
 import os
 import re
+import sys
 from collections import Counter
+from collections.abc import Iterable
 from enum import Enum
+from functools import cache
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 
 from sec_certs import constants
-from sec_certs.cert_rules import REGEXEC_SEP, cc_rules
+from sec_certs.cert_rules import MATCH_END, MATCH_START, REGEXEC_SEP, REGEXEC_SEP_END, REGEXEC_SEP_START, cc_rules
 from sec_certs.constants import FILE_ERRORS_STRATEGY, LINE_SEPARATOR, MAX_ALLOWED_MATCH_LENGTH
 
 logger = logging.getLogger(__name__)
 
+_NAMED_GROUP_START = re.compile(r"\(\?P<\w+>")
+_SURROGATE_ESCAPE = re.compile("[\udc80-\udcff]")
+
+# Header rules of the BSI certification reports, compiled once together with the trailing separator.
+BSI_RULES_CERTIFICATE_PREFACE = [
+    (rule, re.compile(rule + REGEXEC_SEP))
+    for rule in ["(BSI-DSZ-CC-.+?) (?:for|For) (.+?) from (.*)", "(BSI-DSZ-CC-.+?) zu (.+?) der (.*)"]
+]
+BSI_RULES_CERTIFICATE_THIRD = [
+    re.compile("PP Conformance: (.+)Functionality: (.+)Assurance: (.+)The IT Product identified" + REGEXEC_SEP)
+]
+
+
+_REGEX_METACHARACTERS = frozenset("\\.^$*+?{}[]|()")
+
+
+def _literal_segments(rule: str) -> tuple[str, ...]:
+    """
+    Returns the literal parts of a header rule between its groups, a text can only match the rule if it contains all
+    of them in this order.
+    """
+    return tuple(
+        segment
+        for segment in re.split(r"\((?:\.[+*])?\)", rule)
+        if segment and not _REGEX_METACHARACTERS.intersection(segment)
+    )
 
-def search_only_headers_anssi(filepath: Path):  # noqa: C901
-    # TODO: Please, refactor me. I reallyyyyyyyyyyyyy need it!!!!!!
-    class HEADER_TYPE(Enum):
-        HEADER_FULL = 1
-        HEADER_MISSING_CERT_ITEM_VERSION = 2
-        HEADER_MISSING_PROTECTION_PROFILES = 3
-        HEADER_DUPLICITIES = 4
 
-    rules_certificate_preface = [
+def _contains_in_order(text: str, literals: tuple[str, ...], found_ends: dict[tuple[str, ...], int]) -> bool:
+    """
+    Checks whether `text` contains `literals` one after another. The end of the earliest occurrence of each prefix
+    of the literals is kept in `found_ends`, so that the prefixes shared by the header rules are searched only once.
+    """
+    pos = 0
+    for i, literal in enumerate(literals, 1):
+        prefix = literals[:i]
+        end = found_ends.get(prefix)
+        if end is None:
+            start = text.find(literal, pos)
+            end = -1 if start == -1 else start + len(literal)
+            found_ends[prefix] = end
+        if end == -1:
+            return False
+        pos = end
+    return True
+
+
+class HEADER_TYPE(Enum):
+    HEADER_FULL = 1
+    HEADER_MISSING_CERT_ITEM_VERSION = 2
+    HEADER_MISSING_PROTECTION_PROFILES = 3
+    HEADER_DUPLICITIES = 4
+
+
+# Header rules of the ANSSI certification reports, compiled once together with the trailing separator.
+ANSSI_RULES_CERTIFICATE_PREFACE = [
+    (header_type, rule, re.compile(rule + REGEXEC_SEP), _literal_segments(rule))
+    for header_type, rule in [
         (
             HEADER_TYPE.HEADER_FULL,
             "Référence du rapport de certification(.+)Nom du produit(.+)Référence/version du produit(.*)Conformité à un profil de protection(.+)Critères d'évaluation et version(.+)Niveau d'évaluation(.+)Développeurs(.+)Centre d'évaluation(.+)Accords de reconnaissance applicables",
@@ -190,13 +242,22 @@ def search_only_headers_anssi(filepath: Path):  # noqa: C901
             "Référence du rapport de certification(.+)Nom du produit(.+)Référence/version du produit(.+)Critères d'évaluation et version(.+)Niveau d'évaluation(.+)Développeurs(.+)Centre d'évaluation(.+)Accords de reconnaissance applicables",
         ),
     ]
+]
 
-    # statistics about rules success rate
-    num_rules_hits = {}
-    for rule in rules_certificate_preface:
-        num_rules_hits[rule[1]] = 0
 
-    items_found = {}  # type: ignore # noqa
+def _normalize_header_fields(items_found: dict) -> None:
+    """
+    Normalizes the header fields found in a document in place. Later matches overwrite the fields of earlier ones, so
+    the fields are stored raw during matching and only their final values are normalized.
+    """
+    for tag, value in items_found.items():
+        if tag != constants.TAG_HEADER_MATCH_RULES:
+            items_found[tag] = normalize_match_string(value)
+
+
+def search_only_headers_anssi(filepath: Path):  # noqa: C901
+    # TODO: Please, refactor me. I reallyyyyyyyyyyyyy need it!!!!!!
+    items_found: dict[str, str | list[str]] = {}
 
     try:
         whole_text, whole_text_with_newlines, was_unicode_decode_error = load_text_file(filepath)
@@ -208,77 +269,74 @@ def search_only_headers_anssi(filepath: Path):  # noqa: C901
             if pos != -1:
                 whole_text = whole_text[pos:]
 
-        no_match_yet = True
-        other_rule_already_match = False
-        rule_index = -1
-        for rule in rules_certificate_preface:
-            rule_index += 1
-            rule_and_sep = rule[1] + REGEXEC_SEP
-
-            for m in re.finditer(rule_and_sep, whole_text):
-                if no_match_yet:
-                    items_found[constants.TAG_HEADER_MATCH_RULES] = []
-                    no_match_yet = False
-
-                # insert rule if at least one match for it was found
-                if rule not in items_found[constants.TAG_HEADER_MATCH_RULES]:
-                    items_found[constants.TAG_HEADER_MATCH_RULES].append(rule[1])
-
-                if not other_rule_already_match:
-                    other_rule_already_match = True
-                else:
-                    logger.warning(f"WARNING: multiple rules are matching same certification document: {filepath}")
-
-                num_rules_hits[rule[1]] += 1  # add hit to this rule
-                match_groups = m.groups()
-                index_next_item = 0
-                items_found[constants.TAG_CERT_ID] = normalize_match_string(match_groups[index_next_item])
+        found_ends: dict[tuple[str, ...], int] = {}
+        # Scanning for the literal parts of a rule is much cheaper than running it with all its greedy groups.
+        candidate_rules = [
+            rule for rule in ANSSI_RULES_CERTIFICATE_PREFACE if _contains_in_order(whole_text, rule[3], found_ends)
+        ]
+
+        # The header is read from the last match of the last matching rule. Rules are therefore tried from the end,
+        # and once that match is found, the earlier rules are only checked for having a match at all.
+        last_match = None
+        num_matches = 0
+        matched_rules: list[str] = []
+        for rule in reversed(candidate_rules):
+            if last_match is None:
+                for m in rule[2].finditer(whole_text):
+                    last_match = (rule[0], m)
+                    num_matches += 1
+                if last_match is not None:
+                    matched_rules.append(rule[1])
+            elif rule[2].search(whole_text):
+                matched_rules.append(rule[1])
+                num_matches += 1
+
+        if last_match is not None:
+            # insert rule if at least one match for it was found, in the order of the rules
+            items_found[constants.TAG_HEADER_MATCH_RULES] = list(dict.fromkeys(reversed(matched_rules)))
+
+            header_type, m = last_match
+            match_groups = m.groups()
+            index_next_item = 0
+            items_found[constants.TAG_CERT_ID] = match_groups[index_next_item]
+            index_next_item += 1
+
+            items_found[constants.TAG_CERT_ITEM] = match_groups[index_next_item]
+            index_next_item += 1
+
+            if header_type == HEADER_TYPE.HEADER_MISSING_CERT_ITEM_VERSION:
+                items_found[constants.TAG_CERT_ITEM_VERSION] = ""
+            else:
+                items_found[constants.TAG_CERT_ITEM_VERSION] = match_groups[index_next_item]
                 index_next_item += 1
 
-                items_found[constants.TAG_CERT_ITEM] = normalize_match_string(match_groups[index_next_item])
+            if header_type == HEADER_TYPE.HEADER_MISSING_PROTECTION_PROFILES:
+                items_found[constants.TAG_REFERENCED_PROTECTION_PROFILES] = ""
+            else:
+                items_found[constants.TAG_REFERENCED_PROTECTION_PROFILES] = match_groups[index_next_item]
                 index_next_item += 1
 
-                if rule[0] == HEADER_TYPE.HEADER_MISSING_CERT_ITEM_VERSION:
-                    items_found[constants.TAG_CERT_ITEM_VERSION] = ""
-                else:
-                    items_found[constants.TAG_CERT_ITEM_VERSION] = normalize_match_string(match_groups[index_next_item])
-                    index_next_item += 1
-
-                if rule[0] == HEADER_TYPE.HEADER_MISSING_PROTECTION_PROFILES:
-                    items_found[constants.TAG_REFERENCED_PROTECTION_PROFILES] = ""
-                else:
-                    items_found[constants.TAG_REFERENCED_PROTECTION_PROFILES] = normalize_match_string(
-                        match_groups[index_next_item]
-                    )
-                    index_next_item += 1
+            items_found[constants.TAG_CC_VERSION] = match_groups[index_next_item]
+            index_next_item += 1
 
-                items_found[constants.TAG_CC_VERSION] = normalize_match_string(match_groups[index_next_item])
-                index_next_item += 1
+            items_found[constants.TAG_CC_SECURITY_LEVEL] = match_groups[index_next_item]
+            index_next_item += 1
 
-                items_found[constants.TAG_CC_SECURITY_LEVEL] = normalize_match_string(match_groups[index_next_item])
-                index_next_item += 1
+            items_found[constants.TAG_DEVELOPER] = match_groups[index_next_item]
+            index_next_item += 1
 
-                items_found[constants.TAG_DEVELOPER] = normalize_match_string(match_groups[index_next_item])
-                index_next_item += 1
+            items_found[constants.TAG_CERT_LAB] = match_groups[index_next_item]
 
-                items_found[constants.TAG_CERT_LAB] = normalize_match_string(match_groups[index_next_item])
-                index_next_item += 1
+        if num_matches > 1:
+            logger.warning(f"WARNING: multiple rules are matching same certification document: {filepath}")
+
+        _normalize_header_fields(items_found)
     except Exception as e:
         relative_filepath = "/".join(str(filepath).split("/")[-4:])
         error_msg = f"Failed to parse ANSSI frontpage headers from {relative_filepath}; {e}"
         logger.error(error_msg)
         return error_msg, None
 
-    # if True:
-    #     print('# hits for rule')
-    #     sorted_rules = sorted(num_rules_hits.items(),
-    #                           key=operator.itemgetter(1), reverse=True)
-    #     used_rules = []
-    #     for rule in sorted_rules:
-    #         print('{:4d} : {}'.format(rule[1], rule[0]))
-    #         if rule[1] > 0:
-    #             used_rules.append(rule[0])
-
     return constants.RETURNCODE_OK, items_found
 
 
@@ -286,13 +344,8 @@ def search_only_headers_bsi(filepath: Path):  # noqa: C901
     # TODO: Please, refactor me. I reallyyyyyyyyyyyyy need it!!!!!!
     LINE_SEPARATOR_STRICT = " "
     NUM_LINES_TO_INVESTIGATE = 15
-    rules_certificate_preface = [
-        "(BSI-DSZ-CC-.+?) (?:for|For) (.+?) from (.*)",
-        "(BSI-DSZ-CC-.+?) zu (.+?) der (.*)",
-    ]
 
     items_found = {}  # type: ignore # noqa
-    no_match_yet = True
 
     try:
         # Process front page with info: cert_id, certified_item and developer
@@ -300,17 +353,13 @@ def search_only_headers_bsi(filepath: Path):  # noqa: C901
             filepath, NUM_LINES_TO_INVESTIGATE, LINE_SEPARATOR_STRICT
         )
 
-        for rule in rules_certificate_preface:
-            rule_and_sep = rule + REGEXEC_SEP
-
-            for m in re.finditer(rule_and_sep, whole_text):
-                if no_match_yet:
-                    items_found[constants.TAG_HEADER_MATCH_RULES] = []
-                    no_match_yet = False
-
+        matched_rules: set[str] = set()
+        for rule, pattern in BSI_RULES_CERTIFICATE_PREFACE:
+            for m in pattern.finditer(whole_text):
                 # insert rule if at least one match for it was found
-                if rule not in items_found[constants.TAG_HEADER_MATCH_RULES]:
-                    items_found[constants.TAG_HEADER_MATCH_RULES].append(rule)
+                if rule not in matched_rules:
+                    matched_rules.add(rule)
+                    items_found.setdefault(constants.TAG_HEADER_MATCH_RULES, []).append(rule)
 
                 match_groups = m.groups()
                 cert_id = match_groups[0]
@@ -337,21 +386,17 @@ def search_only_headers_bsi(filepath: Path):  # noqa: C901
                 if end_pos != -1:
                     developer = developer[:end_pos]
 
-                items_found[constants.TAG_CERT_ID] = normalize_match_string(cert_id)
-                items_found[constants.TAG_CERT_ITEM] = normalize_match_string(certified_item)
-                items_found[constants.TAG_DEVELOPER] = normalize_match_string(developer)
+                items_found[constants.TAG_CERT_ID] = cert_id
+                items_found[constants.TAG_CERT_ITEM] = certified_item
+                items_found[constants.TAG_DEVELOPER] = developer
                 items_found[constants.TAG_CERT_LAB] = "BSI"
 
         # Process page with more detailed sample info
         # PP Conformance, Functionality, Assurance
-        rules_certificate_third = ["PP Conformance: (.+)Functionality: (.+)Assurance: (.+)The IT Product identified"]
-
         whole_text, whole_text_with_newlines, was_unicode_decode_error = load_text_file(filepath)
 
-        for rule in rules_certificate_third:
-            rule_and_sep = rule + REGEXEC_SEP
-
-            for m in re.finditer(rule_and_sep, whole_text):
+        for pattern in BSI_RULES_CERTIFICATE_THIRD:
+            for m in pattern.finditer(whole_text):
                 # check if previous rules had at least one match
                 if constants.TAG_CERT_ID not in items_found:
                     logger.error(f"ERROR: front page not found for file: {filepath}")
@@ -361,11 +406,11 @@ def search_only_headers_bsi(filepath: Path):  # noqa: C901
                 cc_version = match_groups[1]
                 cc_security_level = match_groups[2]
 
-                items_found[constants.TAG_REFERENCED_PROTECTION_PROFILES] = normalize_match_string(
-                    ref_protection_profiles
-                )
-                items_found[constants.TAG_CC_VERSION] = normalize_match_string(cc_version)
-                items_found[constants.TAG_CC_SECURITY_LEVEL] = normalize_match_string(cc_security_level)
+                items_found[constants.TAG_REFERENCED_PROTECTION_PROFILES] = ref_protection_profiles
+                items_found[constants.TAG_CC_VERSION] = cc_version
+                items_found[constants.TAG_CC_SECURITY_LEVEL] = cc_security_level
+
+        _normalize_header_fields(items_found)
 
         # print('\n*** Certificates without detected preface:')
         # for file_name in files_without_match:
@@ -418,9 +463,7 @@ def search_only_headers_nscib(filepath: Path):  # noqa: C901
                     no_match_yet = False
 
                 # all lines above till 'Certification Report' or 'Assurance Continuity Maintenance Report'
-                certified_item = ""
-                for name_index in range(item_offset, line_index):
-                    certified_item += lines[name_index] + " "
+                certified_item = "".join(lines[name_index] + " " for name_index in range(item_offset, line_index))
                 developer = line[line.find(SPONSORDEVELOPER_STR) + len(SPONSORDEVELOPER_STR) :]
 
             SPONSOR_STR = "Sponsor:"
@@ -431,9 +474,7 @@ def search_only_headers_nscib(filepath: Path):  # noqa: C901
                     no_match_yet = False
 
                 # all lines above till 'Certification Report' or 'Assurance Continuity Maintenance Report'
-                certified_item = ""
-                for name_index in range(item_offset, line_index):
-                    certified_item += lines[name_index] + " "
+                certified_item = "".join(lines[name_index] + " " for name_index in range(item_offset, line_index))
 
             DEVELOPER_STR = "Developer:"
             if DEVELOPER_STR in line:
@@ -493,9 +534,7 @@ def search_only_headers_niap(filepath: Path):
                     no_match_yet = False
 
                 # all lines above till 'Certification Report' or 'Assurance Continuity Maintenance Report'
-                certified_item = ""
-                for name_index in range(item_offset, line_index):
-                    certified_item += lines[name_index] + " "
+                certified_item = "".join(lines[name_index] + " " for name_index in range(item_offset, line_index))
                 cert_id = line[line.find(REPORTNUM_STR) + len(REPORTNUM_STR) :]
                 break
 
@@ -655,30 +694,31 @@ def extract_keywords(filepath: Path, search_rules) -> dict[str, dict[str, int]]
     try:
         whole_text, whole_text_with_newlines, was_unicode_decode_error = load_text_file(filepath, -1, LINE_SEPARATOR)
 
-        def extract(rules):
+        # The results are pruned as they are built (see `prune_matches`), instead of walking them once more.
+        def extract(rules, depth):
+            # Most of the rule groups do not match a document at all, one combined scan rules them out at once.
+            group_patterns = _flatten_rules(rules)
+            if len(group_patterns) > 1 and not _any_rule_pattern(group_patterns).search(whole_text):
+                return _no_matches(rules, depth)
+
             if isinstance(rules, dict):
-                return {k: extract(v) for k, v in rules.items()}
+                res = {}
+                for k, v in rules.items():
+                    r = extract(v, depth + 1)
+                    if r is not None:
+                        res[k] = r
+                return res if res or (depth == 1 and rules) else None
             if isinstance(rules, list):
-                matches = [extract(rule) for rule in rules]
-                c = Counter()
-                for match_list in matches:
-                    c += Counter(match_list)
-                return dict(c)
+                c: Counter[str] = Counter()
+                for rule in rules:
+                    c.update(
+                        _count_rule_matches(rule, whole_text) if isinstance(rule, re.Pattern) else extract(rule, 0)
+                    )
+                return dict(c) if c else None
             if isinstance(rules, re.Pattern):
-                rule = rules
-                matches = []
-                for match in rule.finditer(whole_text):
-                    match = match.group("match")
-                    match = normalize_match_string(match)
-
-                    match_len = len(match)
-                    if match_len > MAX_ALLOWED_MATCH_LENGTH:
-                        logger.warning(f"Excessive match with length of {match_len} detected for rule {rule.pattern}")
-                    matches.append(match)
-                return matches
-
-        result = extract(search_rules)
-        return prune_matches(result)
+                return list(_count_rule_matches(rules, whole_text).elements())
+
+        return extract(search_rules, 0)
     except Exception as e:
         relative_filepath = "/".join(str(filepath).split("/")[-4:])
         error_msg = f"Failed to parse keywords from: {relative_filepath}; {e}"
@@ -686,8 +726,74 @@ def extract_keywords(filepath: Path, search_rules) -> dict[str, dict[str, int]]
         return None
 
 
+def _count_rule_matches(rule: re.Pattern, whole_text: str) -> Counter[str]:
+    """
+    Count the normalized matches of `rule` in `whole_text`. Each distinct match string is normalized just once and,
+    when the rule has no groups besides the `match` one, no match objects are created at all. The match strings are
+    interned, as the same keywords are keys in the dictionaries of many certificates.
+    """
+    if rule.groups == 1:
+        raw_matches = Counter(rule.findall(whole_text))
+    else:
+        raw_matches = Counter(match.group("match") for match in rule.finditer(whole_text))
+
+    matches: Counter[str] = Counter()
+    for raw_match, count in raw_matches.items():
+        match = normalize_match_string(raw_match)
+        match_len = len(match)
+        if match_len > MAX_ALLOWED_MATCH_LENGTH:
+            logger.warning(f"Excessive match with length of {match_len} detected for rule {rule.pattern}")
+        matches[sys.intern(match)] += count
+    return matches
+
+
+def _flatten_rules(rules) -> tuple[re.Pattern, ...]:
+    if isinstance(rules, dict):
+        return tuple(itertools.chain.from_iterable(_flatten_rules(x) for x in rules.values()))
+    if isinstance(rules, list):
+        return tuple(itertools.chain.from_iterable(_flatten_rules(x) for x in rules))
+    return (rules,)
+
+
+def _no_matches(rules, depth: int):
+    """
+    Returns the (pruned) result that `extract_keywords` produces for `rules` at `depth` when none of them matches.
+    """
+    if isinstance(rules, dict):
+        res = {}
+        for k, v in rules.items():
+            r = _no_matches(v, depth + 1)
+            if r is not None:
+                res[k] = r
+        return res if res or (depth == 1 and rules) else None
+    if isinstance(rules, list):
+        return None
+    return []
+
+
+@cache
+def _any_rule_pattern(rules: tuple[re.Pattern, ...]) -> re.Pattern:
+    """
+    Combines keyword rules into a single alternation that matches wherever any of the rules matches.
+    Named groups are turned into non-capturing ones, as their names repeat across the rules. The separators
+    shared by all the rules are factored out, so that the alternatives are tried only after a separator.
+    """
+    start, end = REGEXEC_SEP_START + MATCH_START, MATCH_END + REGEXEC_SEP_END
+    if all(rule.pattern.startswith(start) and rule.pattern.endswith(end) for rule in rules):
+        alternatives = [rule.pattern[len(start) : -len(end)] for rule in rules]
+        start, end = REGEXEC_SEP_START, REGEXEC_SEP_END
+    else:
+        alternatives = [rule.pattern for rule in rules]
+        start, end = "", ""
+    alternation = "|".join(_NAMED_GROUP_START.sub("(?:", x) for x in alternatives)
+    return re.compile(start + "(?:" + alternation + ")" + end, re.MULTILINE)
+
+
 def normalize_match_string(match: str) -> str:
     match = match.strip().strip("[];.”\"':)(,").rstrip(os.sep).replace("  ", " ")
+    # Matches rarely contain non-printable characters, check the whole string at once before filtering per character.
+    if match.isprintable():
+        return match
     return "".join(filter(str.isprintable, match))
 
 
@@ -704,37 +810,25 @@ def load_text_file(
     :return: A tuple of three elements (the text with replaced newlines, the text and a boolean whether a unicode
              decoding error happened).
     """
-    lines = []
-    was_unicode_decode_error = False
-    with Path(file_name).open("r", errors=FILE_ERRORS_STRATEGY) as f:
-        try:
-            lines = f.readlines()
-        except UnicodeDecodeError:
-            was_unicode_decode_error = True
-            logger.warning("UnicodeDecodeError, opening as utf8")
-
+    # The file is read once, the error handler escapes undecodable bytes instead of raising, which then is detected
+    # by the presence of the escape surrogates.
+    with Path(file_name).open("r", encoding="utf8", errors=FILE_ERRORS_STRATEGY) as f:
+        text = f.read()
+    was_unicode_decode_error = _SURROGATE_ESCAPE.search(text) is not None
     if was_unicode_decode_error:
-        with Path(file_name).open("r", encoding="utf8", errors=FILE_ERRORS_STRATEGY) as f2:
-            # coding failure, try line by line
-            line = " "
-            while line:
-                try:
-                    line = f2.readline()
-                    lines.append(line)
-                except UnicodeDecodeError:
-                    # ignore error
-                    continue
-
-    whole_text = ""
-    whole_text_with_newlines = ""
-    for lines_included, line in enumerate(lines):
-        if limit_max_lines != -1 and lines_included >= limit_max_lines:
-            break
-
-        whole_text_with_newlines += line
-        line = line.replace("\n", "")
-        whole_text += line
-        whole_text += line_separator
+        logger.debug(f"Undecodable bytes in {file_name}, escaped them")
+
+    # Lines are split and joined at the C level, instead of concatenating the strings line by line. With a limit,
+    # only the needed lines are split off the text.
+    lines = text.split("\n") if limit_max_lines == -1 else text.split("\n", limit_max_lines)
+    if not lines[-1]:
+        lines.pop()
+    if limit_max_lines != -1 and len(lines) > limit_max_lines:
+        lines = lines[:limit_max_lines]
+        text = "\n".join([*lines, ""])
+
+    whole_text = line_separator.join(lines) + line_separator if lines else ""
+    whole_text_with_newlines = text
 
     return whole_text, whole_text_with_newlines, was_unicode_decode_error
 
@@ -757,10 +851,10 @@ def extract_key_paths(dct: dict, current_path: str) -> list[str]:
     matches in the keywords dictionary.
     """
     paths = []
-    for key in dct:
-        if isinstance(dct[key], dict):
-            paths.extend(extract_key_paths(dct[key], current_path + "." + key))
-        elif isinstance(dct[key], list):
+    for key, value in dct.items():
+        if isinstance(value, dict):
+            paths.extend(extract_key_paths(value, current_path + "." + key))
+        elif isinstance(value, list):
             paths.append(current_path + "." + key)
     return paths
 
@@ -772,14 +866,15 @@ def get_sum_of_values_from_dict_path(dct: dict | None, path: str, default: float
     """
     if not dct:
         return np.nan
+    return _get_sum_of_values_from_tokens(dct, path.split("."), default)
 
-    res = dct
 
-    try:
-        for token in path.split("."):
-            res = res[token]
-    except KeyError:
-        return default
+def _get_sum_of_values_from_tokens(dct: dict, tokens: Iterable[str], default: float) -> float:
+    res: Any = dct
+    for token in tokens:
+        res = res.get(token)
+        if res is None:
+            return default
 
     return sum(res.values())
 
@@ -790,9 +885,18 @@ def get_sums_for_rules_subset(dct: dict | None, path: str) -> dict[str, float]:
     will get the finest resolution and count occurences of the keys in the
     examined dictionary.
     """
-    cc_rules_subset_to_search = rules_get_subset(path)
-    paths_to_search = extract_key_paths(cc_rules_subset_to_search, path)
-    return {x: get_sum_of_values_from_dict_path(dct, x, np.nan) for x in paths_to_search}
+    key_paths = _rules_subset_key_paths(path)
+    if not dct:
+        return {x: np.nan for x, _ in key_paths}
+    return {x: _get_sum_of_values_from_tokens(dct, tokens, np.nan) for x, tokens in key_paths}
+
+
+@cache
+def _rules_subset_key_paths(path: str) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """
+    The key paths of a cc_rules subset only depend on the static rules, compute (and split) them once per path.
+    """
+    return tuple((x, tuple(x.split("."))) for x in extract_key_paths(rules_get_subset(path), path))
 
 
 scheme_frontpage_functions = {
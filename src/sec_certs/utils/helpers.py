@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import os
 import re
+import shutil
 import time
 from collections.abc import Collection
 from contextlib import nullcontext
 from datetime import datetime
-from functools import partial
+from functools import cache, partial
 from pathlib import Path
 from typing import Any
 
@@ -27,6 +29,8 @@ _PROXIES = {
     "https://csrc.nist.gov/": "https://sec-certs.org/proxy/fips/",
 }
 
+_FIPS_VENDOR_TRANSLATION = str.maketrans({",": None, "®": None, "-": " ", "+": " "})
+
 
 def download_file(
     url: str,
@@ -66,7 +70,7 @@ def download_file(
 
         if r.status_code == requests.codes.ok:
             with ctx() as pbar, output.open("wb") as f:
-                for data in r.iter_content(1024):
+                for data in r.iter_content(64 * 1024):
                     f.write(data)
                     if show_progress_bar:
                         pbar.update(len(data))
@@ -96,6 +100,21 @@ def download_parallel(
     return exit_codes
 
 
+def move_tree(src: Path, dst: Path) -> None:
+    """
+    Moves the contents of `src` directory into `dst` directory, merging them with the existing contents of `dst`.
+    Entries are renamed rather than copied whenever `src` and `dst` reside on the same filesystem.
+    """
+    dst.mkdir(parents=True, exist_ok=True)
+    with os.scandir(src) as entries:
+        for entry in entries:
+            target = dst / entry.name
+            if entry.is_dir(follow_symlinks=False) and target.is_dir():
+                move_tree(Path(entry.path), target)
+            else:
+                shutil.move(entry.path, target)
+
+
 def fips_dgst(cert_id: int | str) -> str:
     return get_first_16_bytes_sha256(str(cert_id))
 
@@ -160,10 +179,7 @@ def compute_heuristics_version(cert_name: str) -> set[str]:
     if not matched_strings:
         matched_strings = [max(x, key=len) for x in re.findall(at_least_something, cert_name, re.IGNORECASE)]
     # Only keep the first occurrence but keep order.
-    matches = []
-    for match in matched_strings:
-        if match not in matches:
-            matches.append(match)
+    matches = list(dict.fromkeys(matched_strings))
     # identified_versions = list(set([max(x, key=len) for x in re.findall(VERSION_PATTERN, cert_name, re.IGNORECASE | re.VERBOSE)]))
     # return identified_versions if identified_versions else ['-']
 
@@ -189,9 +205,7 @@ def normalize_fips_vendor(string: str) -> str:
     - Returns only first 5 tokens
     # TODO: The rationale of the steps outlined above should be investigatated
     """
-    return " ".join(
-        string.replace("(R)", "").replace(",", "").replace("®", "").replace("-", " ").replace("+", " ").split()[:4]
-    )
+    return " ".join(string.replace("(R)", "").translate(_FIPS_VENDOR_TRANSLATION).split()[:4])
 
 
 # Credit: https://stackoverflow.com/questions/18092354/
@@ -208,29 +222,33 @@ def split_unescape(s: str, delim: str, escape: str = "\\", unescape: bool = True
     >>> split_unescape('foo$', ',', '$', unescape=True)
     ['foo$']
     """
-    ret = []
-    current = []
-    itr = iter(s)
-    for ch in itr:
-        if ch == escape:
-            try:
-                # skip the next character; it has been escaped!
-                if not unescape:
-                    current.append(escape)
-                current.append(next(itr))
-            except StopIteration:
-                if unescape:
-                    current.append(escape)
-        elif ch == delim:
-            # split! (add current to the list and reset it)
-            ret.append("".join(current))
-            current = []
+    # Most of the strings (e.g. CPE URIs) contain no escape character at all, those are split at the C level.
+    if escape not in s:
+        return s.split(delim)
+
+    # When delimiter is the escape character, every delimiter escapes the following character and nothing gets split.
+    pieces = [s] if escape == delim else s.split(delim)
+
+    ret = [pieces[0]]
+    for piece in pieces[1:]:
+        previous = ret[-1]
+        if (len(previous) - len(previous.rstrip(escape))) % 2:
+            # Odd number of trailing escape characters, the delimiter was escaped. Glue the pieces back together.
+            ret[-1] = previous + delim + piece
         else:
-            current.append(ch)
-    ret.append("".join(current))
+            ret.append(piece)
+
+    if unescape:
+        pattern = _escaped_char_pattern(escape)
+        ret = [pattern.sub(r"\1", x) if escape in x else x for x in ret]
     return ret
 
 
+@cache
+def _escaped_char_pattern(escape: str) -> re.Pattern:
+    return re.compile(re.escape(escape) + "(.)", re.DOTALL)
+
+
 def warn_if_missing_poppler() -> None:
     """
     Warns user if he misses a poppler dependency
@@ -337,20 +337,17 @@ class CpeMatchNvdDatasetBuilder(NvdDatasetBuilder[dict]):
         dataset_to_fill["timestamp"] = timestamp
 
         inactive_criteria = set()
+        filled_match_strings = dataset_to_fill["match_strings"]
         for m in match_strings:
-            if m["matchString"]["status"] == "Inactive":
-                inactive_criteria.add(m["matchString"]["matchCriteriaId"])
-            else:
-                if "matches" in m["matchString"]:
-                    dataset_to_fill["match_strings"][m["matchString"]["matchCriteriaId"]] = {
-                        "criteria": m["matchString"]["criteria"],
-                        "matches": m["matchString"]["matches"],
-                    }
-                    for version_key in self._VERSION_KEYS:
-                        if version_key in m["matchString"]:
-                            dataset_to_fill["match_strings"][m["matchString"]["matchCriteriaId"]][version_key] = m[
-                                "matchString"
-                            ][version_key]
+            match_string = m["matchString"]
+            if match_string["status"] == "Inactive":
+                inactive_criteria.add(match_string["matchCriteriaId"])
+            elif "matches" in match_string:
+                entry = {"criteria": match_string["criteria"], "matches": match_string["matches"]}
+                for version_key in self._VERSION_KEYS:
+                    if version_key in match_string:
+                        entry[version_key] = match_string[version_key]
+                filled_match_strings[match_string["matchCriteriaId"]] = entry
 
         for inactive in inactive_criteria:
             dataset_to_fill["match_strings"].pop(inactive, None)
@@ -357,52 +357,50 @@ def prepare_cwe_df(
             zip_handle.extractall(tmp_dir)
             xml_filename = zip_handle.namelist()[0]
 
-        root = ET.parse(Path(tmp_dir) / xml_filename).getroot()
-
-    weaknesses = root.find("{http://cwe.mitre.org/cwe-6}Weaknesses")
-    categories = root.find("{http://cwe.mitre.org/cwe-6}Categories")
-    dct: dict[str, Any] = {
-        "cwe_id": [],
-        "cwe_name": [],
-        "cwe_description": [],
-        "type": [],
-        "child_of": [],
-    }
-
-    assert weaknesses
-    for weakness in weaknesses:
-        assert weakness
-        description = weakness.find("{http://cwe.mitre.org/cwe-6}Description")
-        related_weaknesses = weakness.find("{http://cwe.mitre.org/cwe-6}Related_Weaknesses")
-
-        dct["cwe_id"].append("CWE-" + weakness.attrib["ID"])
-        dct["cwe_name"].append(weakness.attrib["Name"])
-        dct["cwe_description"].append(description.text if description is not None else None)
-        dct["type"].append("weakness")
-
-        if related_weaknesses:
-            dct["child_of"].append(
-                {
-                    "CWE-" + x.attrib["CWE_ID"]
-                    for x in related_weaknesses
-                    if x.tag == "{http://cwe.mitre.org/cwe-6}Related_Weakness" and x.attrib["Nature"] == "ChildOf"
-                }
-            )
-        else:
-            dct["child_of"].append(np.nan)
-
-    assert categories
-    for category in categories:
-        assert category
-        summary = category.find("{http://cwe.mitre.org/cwe-6}Summary")
-
-        dct["cwe_id"].append("CWE-" + category.attrib["ID"])
-        dct["cwe_name"].append(category.attrib["Name"])
-        dct["cwe_description"].append(summary.text if summary is not None else None)
-        dct["type"].append("category")
-        dct["child_of"].append(np.nan)
-
-    cwe_df = pd.DataFrame(dct).set_index("cwe_id")
+        # The catalogue is large, stream it and process weaknesses and categories as soon as they are parsed.
+        weakness_rows: list[tuple[str, str, str | None, str, Any]] = []
+        category_rows: list[tuple[str, str, str | None, str, Any]] = []
+        for _, element in ET.iterparse(Path(tmp_dir) / xml_filename):
+            if element.tag == "{http://cwe.mitre.org/cwe-6}Weakness":
+                description = element.find("{http://cwe.mitre.org/cwe-6}Description")
+                related_weaknesses = element.find("{http://cwe.mitre.org/cwe-6}Related_Weaknesses")
+                child_of = (
+                    {
+                        "CWE-" + x.attrib["CWE_ID"]
+                        for x in related_weaknesses
+                        if x.tag == "{http://cwe.mitre.org/cwe-6}Related_Weakness" and x.attrib["Nature"] == "ChildOf"
+                    }
+                    if related_weaknesses
+                    else np.nan
+                )
+                weakness_rows.append(
+                    (
+                        "CWE-" + element.attrib["ID"],
+                        element.attrib["Name"],
+                        description.text if description is not None else None,
+                        "weakness",
+                        child_of,
+                    )
+                )
+                element.clear()
+            elif element.tag == "{http://cwe.mitre.org/cwe-6}Category":
+                summary = element.find("{http://cwe.mitre.org/cwe-6}Summary")
+                category_rows.append(
+                    (
+                        "CWE-" + element.attrib["ID"],
+                        element.attrib["Name"],
+                        summary.text if summary is not None else None,
+                        "category",
+                        np.nan,
+                    )
+                )
+                element.clear()
+
+    assert weakness_rows
+    assert category_rows
+    cwe_df = pd.DataFrame(
+        weakness_rows + category_rows, columns=["cwe_id", "cwe_name", "cwe_description", "type", "child_of"]
+    ).set_index("cwe_id")
     cwe_df["url"] = cwe_df.index.map(lambda x: "https://cwe.mitre.org/data/definitions/" + x.split("-")[1] + ".html")
     cwe_df = cwe_df.replace(r"\n", " ", regex=True)
 
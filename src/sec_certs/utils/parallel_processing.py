@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import time
 from collections.abc import Callable, Iterable
+from functools import partial
 from multiprocessing import cpu_count
 from multiprocessing.pool import Pool, ThreadPool
 from typing import Any
@@ -9,6 +9,23 @@ from typing import Any
 from sec_certs.configuration import config
 from sec_certs.utils.tqdm import tqdm
 
+# The function executed by a worker process, set once per process by the pool initializer.
+_worker_func: Callable
+
+
+def _init_worker(func: Callable) -> None:
+    global _worker_func
+    _worker_func = func
+
+
+def _call_with_index(func: Callable, unpack: bool, indexed_item: tuple[int, Any]) -> tuple[int, Any]:
+    index, item = indexed_item
+    return index, func(*item) if unpack else func(item)
+
+
+def _call_worker_func_with_index(unpack: bool, indexed_item: tuple[int, Any]) -> tuple[int, Any]:
+    return _call_with_index(_worker_func, unpack, indexed_item)
+
 
 def process_parallel(
     func: Callable,
@@ -23,24 +40,32 @@ def process_parallel(
     if max_workers == -1:
         max_workers = cpu_count()
 
-    pool: Pool | ThreadPool = ThreadPool(max_workers) if use_threading else Pool(max_workers)
-    results = (
-        [pool.apply_async(func, (*i,), callback=callback) for i in items]
-        if unpack
-        else [pool.apply_async(func, (i,), callback=callback) for i in items]
-    )
-
-    if progress_bar is True and items:
-        bar = tqdm(total=len(results), desc=progress_bar_desc)
-        while not all(all_done := [x.ready() for x in results]):
-            done_count = len(list(filter(lambda x: x, all_done)))
-            bar.update(done_count - bar.n)
-            time.sleep(1)
-        bar.update(len(results) - bar.n)
-        bar.close()
+    items = list(items)
+    results: list[Any] = [None] * len(items)
+    # Tasks are handed out in small chunks as workers free up, so that stragglers do not stall the pool
+    # and process pools do not pay the pickling round trip for every single item.
+    chunksize = max(1, len(items) // (4 * max_workers))
+    bar = tqdm(total=len(items), desc=progress_bar_desc) if progress_bar is True and items else None
+
+    pool: Pool | ThreadPool
+    if use_threading:
+        pool = ThreadPool(max_workers)
+        task = partial(_call_with_index, func, unpack)
+    else:
+        # The function (with whatever state it is bound to) is sent to each worker process just once,
+        # instead of being pickled along with every chunk of items.
+        pool = Pool(max_workers, initializer=_init_worker, initargs=(func,))
+        task = partial(_call_worker_func_with_index, unpack)
 
-    pool.close()
-    pool.join()
-    pool.terminate()
+    with pool:
+        for index, result in pool.imap_unordered(task, enumerate(items), chunksize=chunksize):
+            results[index] = result
+            if callback is not None:
+                callback(result)
+            if bar is not None:
+                bar.update()
+
+    if bar is not None:
+        bar.close()
 
-    return [r.get() for r in results]
+    return results
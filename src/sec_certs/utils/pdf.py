@@ -53,24 +53,22 @@ def ocr_pdf_file(pdf_path: Path) -> str:
         if ppm.returncode != 0:
             raise ValueError(f"pdftoppm failed: {ppm.returncode}")
 
-        for ppm_path in tmppath.rglob("image*.ppm"):
-            base = ppm_path.with_suffix("")
+        # The text files are collected as they are written, instead of walking and stat-ing the directory again.
+        txt_paths = []
+        for ppm_path in tmppath.glob("image*.ppm"):
+            txt_path = ppm_path.with_suffix(".txt")
             content = pytesseract.image_to_string(Image.open(ppm_path), lang="eng+deu+fra")
 
             if content:
-                with Path(base.with_suffix(".txt")).open("w") as file:
+                with txt_path.open("w") as file:
                     file.write(content)
+                txt_paths.append(txt_path)
             else:
                 raise ValueError(f"OCR failed for document {ppm_path}. Check document manually")
 
-        contents = ""
+        txt_paths.sort(key=lambda txt_path: int(txt_path.stem.split("-")[1]))
 
-        txt_paths = [x for x in tmppath.iterdir() if x.is_file() and "image-" in x.stem and x.suffix == ".txt"]
-        txt_paths = sorted(txt_paths, key=lambda txt_path: int(txt_path.stem.split("-")[1]))
-
-        for txt_path in txt_paths:
-            with txt_path.open("r", encoding="utf-8") as f:
-                contents += f.read()
+        contents = "".join(txt_path.read_text(encoding="utf-8") for txt_path in txt_paths)
     return contents
 
 
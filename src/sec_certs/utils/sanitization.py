@@ -4,6 +4,7 @@ import html
 import logging
 import re
 from datetime import date
+from functools import cache
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -13,13 +14,16 @@ from bs4 import NavigableString
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+# Soft hyphens and non-breaking spaces are dropped from navigable strings in a single pass.
+_NAVIGABLE_STRING_DELETIONS = str.maketrans("", "", "\xad\xa0")
+
 
 def sanitize_navigable_string(string: NavigableString | str | None) -> str | None:
     if not string:
         return None
-    rex = re.compile(r"\s+")
-    string = str(string).strip().replace("\xad", "").replace("\xa0", "")
-    return rex.sub(" ", string)
+    string = str(string).strip().translate(_NAVIGABLE_STRING_DELETIONS)
+    return _WHITESPACE_RE.sub(" ", string)
 
 
 def sanitize_link(record: str | None) -> str | None:
@@ -28,6 +32,7 @@ def sanitize_link(record: str | None) -> str | None:
     return record.replace(":443", "").replace(" ", "%20").replace("http://", "https://")
 
 
+@cache
 def sanitize_link_fname(record: str | None) -> str | None:
     if not record:
         return None
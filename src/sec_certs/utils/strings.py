@@ -5,12 +5,25 @@ from functools import lru_cache
 
 import spacy
 
+_TRADEMARK_SYMBOLS_DELETIONS = str.maketrans("", "", "®™")
+
 
 @lru_cache
 def load_spacy_model(spacy_model_to_load: str = "en_core_web_sm"):
     return spacy.load(spacy_model_to_load, disable=["parser", "ner"])
 
 
+@lru_cache
+def compile_alternation(strings: frozenset[str]) -> re.Pattern | None:
+    """
+    Compiles a pattern matching any of the strings, longest first, so that a string nested in another one does not
+    match on its own. Returns None for no strings, as an empty alternation would match everywhere.
+    """
+    if not strings:
+        return None
+    return re.compile("|".join(re.escape(x) for x in sorted(strings, key=len, reverse=True)))
+
+
 def fully_sanitize_string(string: str) -> str:
     return replace_special_chars_with_space(discard_trademark_symbols(string.lower())).strip()
 
@@ -20,7 +33,7 @@ def replace_special_chars_with_space(string: str) -> str:
 
 
 def discard_trademark_symbols(string: str) -> str:
-    return string.replace("®", "").replace("™", "")
+    return string.translate(_TRADEMARK_SYMBOLS_DELETIONS)
 
 
 def strip_manufacturer_and_version(string: str, manufacturers: set[str] | None, versions: set[str]) -> str:
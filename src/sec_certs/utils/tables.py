@@ -8,13 +8,17 @@ from sec_certs.cert_rules import FIPS_LIST_OF_TABLES
 
 logger = logging.getLogger(__name__)
 
+_LIST_OF_TABLES_ALGORITHM_ENTRY = re.compile(
+    r"^.+?(?:[Ff]unction|[Aa]lgorithm|[Ss]ecurity [Ff]unctions?).+?(?P<page_num>\d+)$", re.MULTILINE
+)
+_TABLE_ALGORITHM_ID = re.compile(r"(?:#?\s?|(?:Cert)\.?[^. ]*?\s?)(?:[CcAa]\s)?(?P<id>[CcAa]? ?\d+)")
+
 
 def parse_list_of_tables(txt: str) -> set[int]:
     """
     Parses list of tables in policy txt, returns page numbers of tables that mention algorithms
     """
-    rr = re.compile(r"^.+?(?:[Ff]unction|[Aa]lgorithm|[Ss]ecurity [Ff]unctions?).+?(?P<page_num>\d+)$", re.MULTILINE)
-    return {int(m.group("page_num")) for m in rr.finditer(txt)}
+    return {int(m.group("page_num")) for m in _LIST_OF_TABLES_ALGORITHM_ENTRY.finditer(txt)}
 
 
 def get_table_rich_page_numbers_from_footer(file_text: str) -> set[int]:
@@ -58,5 +62,4 @@ def find_pages_with_tables(txt_filepath: Path) -> set[int]:
 
 
 def get_algs_from_table(dataframe_text: str) -> set[str]:
-    reg = r"(?:#?\s?|(?:Cert)\.?[^. ]*?\s?)(?:[CcAa]\s)?(?P<id>[CcAa]? ?\d+)"
-    return {m.group() for m in re.finditer(reg, dataframe_text)}
+    return {m.group() for m in _TABLE_ALGORITHM_ID.finditer(dataframe_text)}
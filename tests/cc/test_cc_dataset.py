@@ -137,6 +137,25 @@ def test_process_pp_dataset(toy_dataset: CCDataset):
         assert toy_dataset.pp_dataset_path.stat().st_size > constants.MIN_CC_PP_DATASET_SIZE
 
 
+def test_move_dataset(toy_dataset: CCDataset, tmp_path: Path):
+    toy_dataset.copy_dataset(tmp_path / "old")
+    toy_dataset.to_json()
+    toy_dataset.move_dataset(tmp_path / "new")
+    assert toy_dataset.root_dir == tmp_path / "new"
+    assert toy_dataset.json_path.exists()
+    assert not (tmp_path / "old").exists()
+
+
+@pytest.mark.parametrize("new_root_dir", [".", "subdir", "subdir/nested"])
+def test_move_dataset_into_itself(toy_dataset: CCDataset, tmp_path: Path, new_root_dir: str):
+    toy_dataset.copy_dataset(tmp_path)
+    toy_dataset.to_json()
+    with pytest.raises(ValueError):
+        toy_dataset.move_dataset(tmp_path / new_root_dir)
+    assert toy_dataset.root_dir == tmp_path
+    assert toy_dataset.json_path.exists()
+
+
 @pytest.mark.xfail(reason="May fail due to error on CC server")
 def test_download_csv_html_files():
     with TemporaryDirectory() as tmp_dir: